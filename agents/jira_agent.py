@@ -1,27 +1,66 @@
-from typing import Any, Dict, List, Optional
+from __future__ import annotations
+
+from typing import Any
+import asyncio
 import logging
 from services.jira_mcp_client import jira_mcp_client
+from services.mcp_pool import mcp_pool
+from common.async_cache import async_ttl_cache
 
 logger = logging.getLogger(__name__)
 
+# Capture the bound client coroutine once; the wrapper below exists only to
+# rename limit -> max_results and runs without self/MRO dispatch.
+_client_search_issues = jira_mcp_client.search_issues
+
+
+async def _search_issues(jql: str, limit: int = 50) -> Any:
+    return await _client_search_issues(jql, max_results=limit)
+
 
 class JiraAgent:
-    async def list_tools(self) -> List[Dict[str, Any]]:
-        return await jira_mcp_client.list_tools()
+    __slots__ = ()  # stateless singleton; no per-instance __dict__ needed
 
-    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
-        return await jira_mcp_client.call_tool(name, arguments)
+    # Pure forwarders: bind the client coroutine functions directly so calls
+    # hit the real coroutine without an intermediate frame/await.
+    # Read-only lookups are memoized: the tool list rarely changes within a
+    # process, and repeated issue fetches share one round-trip via the cache.
+    list_tools = staticmethod(async_ttl_cache()(jira_mcp_client.list_tools))
+    call_tool = staticmethod(jira_mcp_client.call_tool)
+    get_issue = staticmethod(async_ttl_cache(ttl=30.0)(jira_mcp_client.get_issue))
+    create_issue = staticmethod(jira_mcp_client.create_issue)
+    search_issues = staticmethod(_search_issues)
 
-    async def search_issues(self, jql: str, limit: int = 50) -> Any:
-        return await jira_mcp_client.search_issues(jql, max_results=limit)
+    async def get_issues(self, keys: list[str]) -> Any:
+        """Fetch many issues in one JQL search instead of N get_issue round-trips.
 
-    async def get_issue(self, key: str) -> Any:
-        return await jira_mcp_client.get_issue(key)
+        Prefer this over looping get_issue; callers pay 1 RTT instead of N.
+        """
+        if not keys:
+            return []
+        jql = "key in (" + ",".join(keys) + ")"
+        return await jira_mcp_client.search_issues(jql, max_results=len(keys))
 
-    async def create_issue(self, project_key: str, summary: str, description: str, issue_type: str = "Task") -> Any:
-        return await jira_mcp_client.create_issue(project_key, summary, description, issue_type)
+    async def get_issues_parallel(self, keys: list[str]) -> list[Any]:
+        """Fallback batch fetch: overlap N get_issue calls concurrently."""
+        return list(await asyncio.gather(*(jira_mcp_client.get_issue(k) for k in keys)))
 
 
 jira_agent = JiraAgent()
 
 
+async def warmup() -> None:
+    """Prime the Jira MCP session and tool-list cache.
+
+    Awaited from the app startup hook so the first user request does not pay
+    server spawn + session handshake + tool discovery.
+    """
+    try:
+        # A persisted catalog makes list_tools a cache hit that never touches
+        # the server, and call_tool runs on pooled sessions — so warm a pool
+        # session explicitly with a no-op ping, then prime the catalog.
+        async with mcp_pool.acquire("jira") as session:
+            await session.list_tools()
+        await jira_agent.list_tools()
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning("Jira agent warmup failed: %s", exc)
@@ -1,42 +1,62 @@
-from typing import Dict, List, Any
+from __future__ import annotations
+
+from typing import Any
+import asyncio
 import logging
 from services.mcp_client import mcp_client
+from services.mcp_pool import mcp_pool
+from common.async_cache import async_ttl_cache, single_flight
 
 logger = logging.getLogger(__name__)
 
+# Capture bound client coroutines once; the wrappers below exist only to
+# rename limit -> per_page and run without self/MRO dispatch.
+_client_list_repositories = mcp_client.list_repositories
+_client_list_commits = mcp_client.list_commits
+
+
+async def _list_repositories(owner: str | None = None, limit: int = 30) -> list[dict[str, Any]]:
+    return await _client_list_repositories(owner=owner, per_page=limit)
+
+
+async def _list_commits(owner: str, repo: str, limit: int = 30, sha: str | None = None, path: str | None = None) -> list[dict[str, Any]]:
+    return await _client_list_commits(owner, repo, sha=sha, path=path, per_page=limit)
+
 
 class MCPAgent:
-    async def get_repository(self, owner: str, repo: str) -> Dict[str, Any]:
-        return await mcp_client.get_repository(owner, repo)
-
-    async def list_repositories(self, owner: str = None, limit: int = 30) -> List[Dict[str, Any]]:
-        return await mcp_client.list_repositories(owner=owner, per_page=limit)
-
-    async def list_commits(self, owner: str, repo: str, limit: int = 30, sha: str = None, path: str = None) -> List[Dict[str, Any]]:
-        return await mcp_client.list_commits(owner, repo, sha=sha, path=path, per_page=limit)
-
-    async def get_commit(self, owner: str, repo: str, commit_sha: str) -> Dict[str, Any]:
-        return await mcp_client.get_commit(owner, repo, commit_sha)
-
-    async def search_issues(
-        self,
-        query: str,
-        owner: str | None = None,
-        repo: str | None = None,
-        order: str | None = None,
-        sort: str | None = None,
-        page: int | None = None,
-        per_page: int | None = None,
-    ) -> List[Dict[str, Any]]:
-        return await mcp_client.search_issues(
-            query=query,
-            owner=owner,
-            repo=repo,
-            order=order,
-            sort=sort,
-            page=page,
-            per_page=per_page,
-        )
+    __slots__ = ()  # stateless singleton; no per-instance __dict__ needed
+
+    # Pure forwarders: bind the client coroutine functions directly so calls
+    # hit the real coroutine without an intermediate frame/await.
+    # Repository metadata changes rarely; a short TTL collapses repeated
+    # lookups for the same repo into one round-trip.
+    get_repository = staticmethod(async_ttl_cache(ttl=30.0)(mcp_client.get_repository))
+    # get_commit results are immutable but large; dedupe overlapping fetches
+    # for the same ref without retaining them.
+    get_commit = staticmethod(single_flight(mcp_client.get_commit))
+    search_issues = staticmethod(mcp_client.search_issues)
+    list_repositories = staticmethod(_list_repositories)
+    list_commits = staticmethod(_list_commits)
+
+    async def get_commits(self, owner: str, repo: str, shas: list[str]) -> list[dict[str, Any]]:
+        """Fetch many commits concurrently instead of N sequential round-trips."""
+        return list(await asyncio.gather(*(mcp_client.get_commit(owner, repo, sha) for sha in shas)))
 
 
 mcp_agent = MCPAgent()
+
+
+async def warmup() -> None:
+    """Prime the GitHub MCP session so the first request reuses a live connection.
+
+    Awaited from the app startup hook; errors are logged, not raised, so a
+    misconfigured GitHub integration does not block startup.
+    """
+    try:
+        await mcp_client._ensure_client()  # pylint: disable=protected-access
+        # Tool calls run on pooled sessions, which the direct client warmup
+        # above does not create; ping one so the first request finds it live.
+        async with mcp_pool.acquire("github") as session:
+            await session.list_tools()
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning("GitHub agent warmup failed: %s", exc)
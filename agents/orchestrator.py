@@ -4,71 +4,221 @@ import asyncio
 import json
 import logging
 import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
+from cachetools import TTLCache
+
+from common import jsonfast
 from services.jira_mcp_client import jira_mcp_client
 from services.mcp_client import mcp_client as github_mcp_client
+from services.mcp_pool import mcp_pool
 from config import settings
 
 
 logger = logging.getLogger(__name__)
 
+# Patterns used on every planner invocation, compiled once at import.
+_WORD_RE = re.compile(r"[a-z0-9_\-]+")
+_REPO_FILTER_RE = re.compile(r"repo:([\w.-]+/[\w.-]+)", re.IGNORECASE)
+_GH_URL_RE = re.compile(r"github\.com/([\w.-]+)/([\w.-]+)", re.IGNORECASE)
+_TITLE_RE = re.compile(r"title\s*[-:]\s*(.+?)(?:,|$)", re.IGNORECASE)
+_DESC_RE = re.compile(r"description\s*[-:]\s*(.+)$", re.IGNORECASE)
+_SHA_RE = re.compile(r"\b[0-9a-f]{7,40}\b")
+
+
+def _parse_enforced_repo() -> Optional[Tuple[str, str, str]]:
+    """Parse settings.GITHUB_REPO_URL into (owner, repo, "repo:owner/repo")."""
+    url = settings.GITHUB_REPO_URL.strip()
+    if not url:
+        return None
+    m = _GH_URL_RE.search(url)
+    if not m:
+        return None
+    owner, repo = m.group(1), m.group(2)
+    return owner, repo, f"repo:{owner}/{repo}"
+
+
+def _parse_default_repos() -> Tuple[str, ...]:
+    defaults = [r.strip() for r in settings.GITHUB_DEFAULT_REPOS.split(",") if r.strip()]
+    if _ENFORCED_REPO:
+        defaults.append(f"{_ENFORCED_REPO[0]}/{_ENFORCED_REPO[1]}")
+    # Dedupe case-insensitively once at import, keeping first spelling
+    uniq: Dict[str, str] = {}
+    for r in defaults:
+        uniq.setdefault(r.lower(), r)
+    return tuple(uniq.values())
+
+
+# Settings never change at runtime; evaluate the derived repo scope once.
+_ENFORCED_REPO: Optional[Tuple[str, str, str]] = _parse_enforced_repo()
+_DEFAULT_REPOS: Tuple[str, ...] = _parse_default_repos()
+
 
 class ToolRegistry:
-    """Registry to discover available MCP tools at runtime and cache results."""
+    """Registry to discover available MCP tools at runtime and cache results.
+
+    Discovery results are cached for settings.MCP_TOOLS_CACHE_TTL seconds
+    (negative = cache forever) and can be dropped explicitly via
+    invalidate(), e.g. after an MCP server restart gains or loses tools.
+    """
 
     def __init__(self) -> None:
         self._cached: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._cached_at: float = 0.0
+        self._ttl: float = settings.MCP_TOOLS_CACHE_TTL
+        self._lock = asyncio.Lock()
+        # Per-provider lookup structures rebuilt on every discovery:
+        # lower-cased name -> tool dict, and pre-lowercased (name, name_lower,
+        # "name description" blob) rows for the token heuristic.
+        self._index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._blobs: Dict[str, List[Tuple[str, str, str]]] = {}
+
+    def _is_fresh(self) -> bool:
+        if self._cached is None:
+            return False
+        if self._ttl < 0:
+            return True
+        return (time.monotonic() - self._cached_at) < self._ttl
 
     async def list_tools(self) -> Dict[str, List[Dict[str, Any]]]:
-        if self._cached is not None:
-            return self._cached
+        if self._is_fresh():
+            return self._cached  # type: ignore[return-value]
+
+        # Lock so concurrent cache misses trigger one discovery, not many
+        async with self._lock:
+            if self._is_fresh():
+                return self._cached  # type: ignore[return-value]
+
+            # The two servers are independent; discover them concurrently so
+            # a cold start costs max(jira, github) rather than their sum.
+            jira_tools, gh_tools = await asyncio.gather(
+                self._discover_jira(), self._discover_github()
+            )
+            tools: Dict[str, List[Dict[str, Any]]] = {"jira": jira_tools, "github": gh_tools}
+
+            self._cached = tools
+            self._cached_at = time.monotonic()
+            self._build_index(tools)
+            return tools
+
+    def _build_index(self, tools: Dict[str, List[Dict[str, Any]]]) -> None:
+        index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        blobs: Dict[str, List[Tuple[str, str, str]]] = {}
+        for provider, tool_list in tools.items():
+            name_map: Dict[str, Dict[str, Any]] = {}
+            rows: List[Tuple[str, str, str]] = []
+            for t in tool_list:
+                name = str(t.get("name", ""))
+                if not name:
+                    continue
+                name_map[name.lower()] = t
+                desc = str(t.get("description", ""))
+                rows.append((name, name.lower(), f"{name} {desc}".lower()))
+            index[provider] = name_map
+            blobs[provider] = rows
+        self._index = index
+        self._blobs = blobs
+        _resolve_tool_name_cached.cache_clear()
+
+    def resolve(self, provider: str, preferred_names: List[str], required_tokens: Optional[List[str]] = None) -> Optional[str]:
+        """Pick a tool name via the prebuilt index: preferred names first,
+        then tokens in name+description, then tokens in name only.
+
+        Results are memoized per (provider, preferred, tokens) until the
+        next discovery refresh.
+        """
+        return _resolve_tool_name_cached(
+            provider,
+            tuple(preferred_names),
+            tuple(required_tokens) if required_tokens else None,
+        )
+
+    def _resolve_scan(self, provider: str, preferred_names: Tuple[str, ...], required_tokens: Optional[Tuple[str, ...]]) -> Optional[str]:
+        name_map = self._index.get(provider, {})
+        for pref in preferred_names:
+            t = name_map.get(pref.lower())
+            if t is not None:
+                return str(t.get("name"))
+        if required_tokens:
+            rows = self._blobs.get(provider, [])
+            for name, _name_lower, blob in rows:
+                if all(tok in blob for tok in required_tokens):
+                    return name
+            for name, name_lower, _blob in rows:
+                if all(tok in name_lower for tok in required_tokens):
+                    return name
+        return None
 
-        tools: Dict[str, List[Dict[str, Any]]] = {}
+    def find(self, provider: str, name: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Look up a tool dict by (case-insensitive) name via the index."""
+        if not name:
+            return None
+        return self._index.get(provider, {}).get(name.lower())
 
+    @staticmethod
+    async def _discover_jira() -> List[Dict[str, Any]]:
         try:
             jira_tools_raw = await jira_mcp_client.list_tools()
-            tools["jira"] = _normalize_tools_list(jira_tools_raw)
+            return _normalize_tools_list(jira_tools_raw)
         except (TypeError, ValueError, AttributeError) as exc:
             logger.warning("Unable to list Jira tools: %s", exc)
-            tools["jira"] = []
+            return []
 
+    @staticmethod
+    async def _discover_github() -> List[Dict[str, Any]]:
         try:
-            client = await github_mcp_client._ensure_client()  # pylint: disable=protected-access
-            session = client.get_session("github")
+            session = await github_mcp_client.get_session()
             gh_tools_raw = await session.list_tools()
-            tools["github"] = _normalize_tools_list(gh_tools_raw)
-            logger.info("GitHub tools: %s", tools["github"])
+            gh_tools = _normalize_tools_list(gh_tools_raw)
+            logger.debug("GitHub tools: %s", gh_tools)
+            return gh_tools
         except (TypeError, ValueError, AttributeError) as exc:
             logger.warning("Unable to list GitHub tools: %s", exc)
-            tools["github"] = []
+            return []
 
-        self._cached = tools
-        return tools
+    async def invalidate(self) -> None:
+        """Drop the cached tool lists; the next call re-discovers."""
+        async with self._lock:
+            self._cached = None
+            self._cached_at = 0.0
+            self._index = {}
+            self._blobs = {}
+            _resolve_tool_name_cached.cache_clear()
 
 
 registry = ToolRegistry()
 
 
+@lru_cache(maxsize=256)
+def _resolve_tool_name_cached(provider: str, preferred: Tuple[str, ...], tokens: Optional[Tuple[str, ...]]) -> Optional[str]:
+    # Module-level so lru_cache keys stay hashable; cleared whenever the
+    # registry rebuilds or drops its index.
+    return registry._resolve_scan(provider, preferred, tokens)  # pylint: disable=protected-access
+
+
 def _normalize_tool_item(tool: Any) -> Dict[str, Any]:
     """Coerce an MCP Tool object (or dict) into a plain dict with key fields."""
     if isinstance(tool, dict):
         return tool
     # Try pydantic-style APIs
-    for attr in ("model_dump", "dict"):
-        fn = getattr(tool, attr, None)
-        if callable(fn):
-            try:
-                dumped = fn()
-                if isinstance(dumped, dict):
-                    return dumped
-            except (TypeError, ValueError, AttributeError):
-                pass
+    fn = getattr(tool, "model_dump", None) or getattr(tool, "dict", None)
+    if callable(fn):
+        try:
+            dumped = fn()
+            if isinstance(dumped, dict):
+                return dumped
+        except (TypeError, ValueError, AttributeError):
+            pass
     # Fallback to attribute introspection
     name = getattr(tool, "name", None)
     description = getattr(tool, "description", None)
     input_schema = getattr(tool, "input_schema", None) or getattr(tool, "inputSchema", None)
-    if hasattr(input_schema, "model_dump"):
+    if isinstance(input_schema, dict):
+        pass  # already plain; skip the dump probes
+    elif hasattr(input_schema, "model_dump"):
         try:
             input_schema = input_schema.model_dump()
         except (TypeError, ValueError, AttributeError):
@@ -91,205 +241,223 @@ def _normalize_tool_item(tool: Any) -> Dict[str, Any]:
 def _normalize_tools_list(tools: Any) -> List[Dict[str, Any]]:
     if not isinstance(tools, list):
         return []
-    return [_normalize_tool_item(t) for t in tools]
-
-
-def _extract_keywords(user_message: str, limit: int = 5) -> List[str]:
-    """Extract simple keywords from the user message for queries/JQL."""
-    text = user_message.lower()
-    words = re.findall(r"[a-z0-9_\-]+", text)
-    stop = {
-        "the",
-        "a",
-        "an",
-        "and",
-        "or",
-        "to",
-        "on",
-        "in",
-        "for",
-        "of",
-        "with",
-        "about",
-        "all",
-        "give",
-        "show",
-        "list",
-        "get",
-        "me",
-        "my",
-        "please",
-        "could",
-        "would",
-        "find",
-        "fetch",
-        "retrieve",
-        "past",
-        "history",
-        "issue",
-        "issues",
-        "pr",
-        "pull",
-        "request",
-        "requests",
-        "related",
-        "know",
-        "want",
-    }
+    # Some MCP clients repeat the same Tool instances in one listing;
+    # memoize per call so each instance is normalized once.
+    memo: Dict[int, Dict[str, Any]] = {}
+    normalized: List[Dict[str, Any]] = []
+    for t in tools:
+        item = memo.get(id(t))
+        if item is None:
+            item = _normalize_tool_item(t)
+            memo[id(t)] = item
+        normalized.append(item)
+    return normalized
+
+
+_STOPWORDS: frozenset[str] = frozenset({
+    "the",
+    "a",
+    "an",
+    "and",
+    "or",
+    "to",
+    "on",
+    "in",
+    "for",
+    "of",
+    "with",
+    "about",
+    "all",
+    "give",
+    "show",
+    "list",
+    "get",
+    "me",
+    "my",
+    "please",
+    "could",
+    "would",
+    "find",
+    "fetch",
+    "retrieve",
+    "past",
+    "history",
+    "issue",
+    "issues",
+    "pr",
+    "pull",
+    "request",
+    "requests",
+    "related",
+    "know",
+    "want",
+})
+
+
+def _extract_keywords(user_message: str, limit: int = 5, words: Optional[List[str]] = None) -> List[str]:
+    """Extract simple keywords from the user message for queries/JQL.
+
+    Callers that already tokenized the lowercase message can pass the
+    words to avoid a second regex pass.
+    """
+    if words is None:
+        words = _WORD_RE.findall(user_message.lower())
     keywords: List[str] = []
+    seen: set[str] = set()
     for w in words:
-        if w not in stop and len(w) > 2 and w not in keywords:
+        if len(w) > 2 and w not in _STOPWORDS and w not in seen:
+            seen.add(w)
             keywords.append(w)
-        if len(keywords) >= limit:
-            break
+            if len(keywords) >= limit:
+                break
     return keywords or ["permission"]
 
 
 def _parse_repo_filters(user_message: str) -> List[str]:
     """Extract repo filters of the form repo:owner/name from the user message."""
-    matches = re.findall(r"repo:([\w.-]+/[\w.-]+)", user_message, flags=re.IGNORECASE)
-    # From env default repos
-    defaults = [r.strip() for r in settings.GITHUB_DEFAULT_REPOS.split(",") if r.strip()]
-    # From a single repo URL
-    if settings.GITHUB_REPO_URL:
-        m = re.search(r"github\.com/([\w.-]+)/([\w.-]+)", settings.GITHUB_REPO_URL, flags=re.IGNORECASE)
-        if m:
-            defaults.append(f"{m.group(1)}/{m.group(2)}")
-    # De-duplicate while preserving order
-    seen = set()
-    repos: List[str] = []
-    for r in matches + defaults:
-        key = r.lower()
-        if key not in seen:
-            seen.add(key)
-            repos.append(r)
-    return repos
+    matches = _REPO_FILTER_RE.findall(user_message)
+    if not matches:
+        # Common case: no explicit repo: filter, defaults are pre-deduped
+        return list(_DEFAULT_REPOS)
+    # Single-pass case-insensitive union, message filters first
+    uniq: Dict[str, str] = {}
+    for r in matches:
+        uniq.setdefault(r.lower(), r)
+    for r in _DEFAULT_REPOS:
+        uniq.setdefault(r.lower(), r)
+    return list(uniq.values())
+
+
+# Trigger phrases compiled into single alternation patterns so each intent
+# check is one linear scan of the message instead of one scan per phrase.
+# Longer/compound phrases are redundant with their substrings (e.g. "list
+# commits" with "commit") but kept for documentation of intent.
+_NEEDS_TOOLS_TRIGGERS: frozenset[str] = frozenset({
+    "jira",
+    "github",
+    "issue",
+    "issues",
+    "task",
+    "tasks",
+    "ticket",
+    "pull request",
+    "pr",
+    "permission",
+    "history",
+    "story",
+    "stories",
+    "epic",
+    "epics",
+    "feature",
+    "features",
+    "bug",
+    "bugs",
+    "problem",
+    "problems",
+    "error",
+    "errors",
+    "help",
+    "need",
+    "needs",
+    "want",
+    "wants",
+    "commit",
+    "commits",
+    "repository",
+    "repositories",
+    "repo",
+    "repos",
+    "list repos",
+    "list commits",
+    "commit history",
+})
+
+_CREATE_PATTERNS: frozenset[str] = frozenset({
+    "create a bug",
+    "create bug",
+    "create jira bug",
+    "create jira ticket",
+    "create ticket in jira",
+    "create a ticket",
+    "create ticket",
+    "open a bug",
+    "open bug in jira",
+    "open a ticket",
+    "file a bug",
+    "report a bug",
+    "create issue",
+    "create an issue",
+    "raise a bug",
+})
+
+
+def _compile_any_of(phrases: frozenset[str]) -> re.Pattern:
+    # Longest-first so alternation prefers whole phrases; matching stays
+    # substring-based like the previous `phrase in text` checks.
+    ordered = sorted(phrases, key=len, reverse=True)
+    return re.compile("|".join(re.escape(p) for p in ordered), re.IGNORECASE)
+
+
+_NEEDS_TOOLS_RE = _compile_any_of(_NEEDS_TOOLS_TRIGGERS)
+_CREATE_PATTERNS_RE = _compile_any_of(_CREATE_PATTERNS)
+
+# Word-level intent tokens checked against the tokenized message in _plan.
+# Phrase forms ("pull request", "list repos", "commit history") are covered
+# by their distinctive tokens.
+_ISSUE_PR_TOKENS = frozenset({"issue", "issues", "pr", "prs", "pull"})
+# Singular forms included: the old substring check matched them via
+# "repos" in "repository", and whole-word lookup must keep doing so.
+_REPO_LIST_TOKENS = frozenset({"repositories", "repository", "repos", "repo"})
+_COMMIT_LIST_TOKENS = frozenset({"commits", "history"})
+
+
+@lru_cache(maxsize=1024)
+def _needs_tools_cached(msg_lower: str) -> bool:
+    return _NEEDS_TOOLS_RE.search(msg_lower) is not None
 
 
 def _needs_tools(user_message: str) -> bool:
-    text = user_message.lower()
-    triggers = [
-        "jira",
-        "github",
-        "issue",
-        "issues",
-        "task",
-        "tasks",
-        "ticket",
-        "pull request",
-        "pr",
-        "permission",
-        "history",
-        "story",
-        "stories",
-        "epic",
-        "epics",
-        "feature",
-        "features",
-        "bug",
-        "bugs",
-        "problem",
-        "problems",
-        "error",
-        "errors",
-        "help",
-        "need",
-        "needs",
-        "want",
-        "wants"
-        "commit",
-        "commits",
-        "repository",
-        "repositories",
-        "repo",
-        "repos",
-        "list repos",
-        "list commits",
-        "list commit",
-        "list commit history",
-        "commit history",
-        "commit history",
-    ]
-    return any(t in text for t in triggers)
+    # Memoized on the lowercased message: repeated greetings/small talk skip
+    # even the regex scan, and the cache key is case-normalized.
+    return _needs_tools_cached(user_message.lower())
 
 
 def _wants_direct_create(user_message: str) -> bool:
     """Detect if the user explicitly asks to create a Jira ticket/issue/bug."""
-    text = user_message.lower()
-    patterns = [
-        "create a bug",
-        "create bug",
-        "create jira bug",
-        "create jira ticket",
-        "create ticket in jira",
-        "create a ticket",
-        "create ticket",
-        "open a bug",
-        "open bug in jira",
-        "open a ticket",
-        "file a bug",
-        "report a bug",
-        "create issue",
-        "create an issue",
-        "raise a bug",
-    ]
-    return any(p in text for p in patterns)
+    return _CREATE_PATTERNS_RE.search(user_message) is not None
+
+
+def _jql_escape(value: str) -> str:
+    """Escape backslashes and quotes so user tokens cannot break out of a JQL string."""
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _build_jql(keywords: List[str]) -> Optional[str]:
+    """Build the keyword-search JQL (with ordering) in one pass, or None."""
+    if not keywords:
+        return None
+    body = " OR ".join(
+        f'(summary ~ "{_jql_escape(kw)}" OR description ~ "{_jql_escape(kw)}")' for kw in keywords
+    )
+    return f"({body}) ORDER BY updated DESC"
 
 
 def _parse_title_description(user_message: str) -> Tuple[Optional[str], Optional[str]]:
     """Parse title and description from patterns like 'title - X, description - Y'."""
     title: Optional[str] = None
     description: Optional[str] = None
-    m_title = re.search(r"title\s*[-:]\s*(.+?)(?:,|$)", user_message, flags=re.IGNORECASE)
+    m_title = _TITLE_RE.search(user_message)
     if m_title:
         title = m_title.group(1).strip()
-    m_desc = re.search(r"description\s*[-:]\s*(.+)$", user_message, flags=re.IGNORECASE)
+    m_desc = _DESC_RE.search(user_message)
     if m_desc:
         description = m_desc.group(1).strip()
     return title, description
 
 
-def _resolve_tool_name(tools: List[Dict[str, Any]], preferred_names: List[str], required_tokens: Optional[List[str]] = None) -> Optional[str]:
-    """Pick a tool name from a tool list by preferred names or tokens in name/description."""
-    names = [str(t.get("name", "")) for t in tools]
-    lower_map = {n.lower(): n for n in names if n}
-    # 1) exact preferred name match (case-insensitive)
-    for pref in preferred_names:
-        if pref.lower() in lower_map:
-            return lower_map[pref.lower()]
-    # 2) token-based heuristic
-    if required_tokens:
-        best: Optional[str] = None
-        for t in tools:
-            name = str(t.get("name", ""))
-            desc = str(t.get("description", ""))
-            blob = f"{name} {desc}".lower()
-            if all(tok in blob for tok in required_tokens):
-                best = name
-                break
-        if best:
-            return best
-    # 3) fallback: first tool that contains all tokens in name only
-    if required_tokens:
-        for t in tools:
-            name = str(t.get("name", "")).lower()
-            if all(tok in name for tok in required_tokens):
-                return str(t.get("name"))
-    return None
-
-
-def _find_tool_by_name(tools: List[Dict[str, Any]], name: Optional[str]) -> Optional[Dict[str, Any]]:
-    if not name:
-        return None
-    for t in tools:
-        if str(t.get("name", "")).lower() == name.lower():
-            return t
-    return None
-
-
-def _extract_schema_keys(tool_meta: Optional[Dict[str, Any]]) -> List[str]:
+def _extract_schema_keys(tool_meta: Optional[Dict[str, Any]]) -> Tuple[str, ...]:
     if not tool_meta:
-        return []
+        return ()
     # Common schema key variants in MCP
     schema = (
         tool_meta.get("input_schema")
@@ -299,25 +467,84 @@ def _extract_schema_keys(tool_meta: Optional[Dict[str, Any]]) -> List[str]:
     )
     props = schema.get("properties") if isinstance(schema, dict) else None
     if isinstance(props, dict):
-        return list(props.keys())
-    return []
+        return tuple(props.keys())
+    return ()
 
 
-def _adapt_arguments(provider: str, tool_meta: Optional[Dict[str, Any]], intended_args: Dict[str, Any]) -> Dict[str, Any]:
-    schema_keys = _extract_schema_keys(tool_meta)
+# Bidirectional snake_case <-> camelCase alternates for common Jira fields;
+# extend here instead of branching in _adapt_arguments.
+_JIRA_CASE_ALT: Dict[str, str] = {
+    "project_key": "projectKey",
+    "projectKey": "project_key",
+    "issue_type": "issueType",
+    "issueType": "issue_type",
+    "max_results": "maxResults",
+    "maxResults": "max_results",
+}
+
+
+@dataclass(frozen=True)
+class _AdapterPlan:
+    """Precomputed schema-key choices for one tool schema.
+
+    For a fixed schema the choose-key answers never change, so they are
+    resolved once per distinct schema (see _adapter_plan) instead of on
+    every call.
+    """
+
+    schema_key_set: frozenset
+    keys_lower: Dict[str, str]
+    jql_key: str
+    max_key: str
+    query_key: str
+    per_page_key: str
+    owner_key: str
+    repo_key: str
+    sha_key: str
+    ref_key: str
+    path_key: str
+    order_key: str
+    sort_key: str
+    page_key: str
+
+
+@lru_cache(maxsize=128)
+def _adapter_plan(schema_keys: Tuple[str, ...]) -> _AdapterPlan:
     keys_lower = {k.lower(): k for k in schema_keys}
 
-    def choose_key(candidates: List[str], default_key: str) -> str:
+    def choose_key(candidates: Tuple[str, ...], default_key: str) -> str:
         for c in candidates:
             k = keys_lower.get(c.lower())
             if k:
                 return k
         return default_key
 
+    return _AdapterPlan(
+        schema_key_set=frozenset(schema_keys),
+        keys_lower=keys_lower,
+        jql_key=choose_key(("jql", "query", "jqlQuery"), "jql"),
+        max_key=choose_key(("maxResults", "max_results", "limit"), "maxResults"),
+        query_key=choose_key(("query", "q"), "query"),
+        per_page_key=choose_key(("perPage", "per_page", "limit"), "perPage"),
+        owner_key=choose_key(("owner", "user", "org"), "owner"),
+        repo_key=choose_key(("repo", "repository"), "repo"),
+        sha_key=choose_key(("sha", "start_sha"), "sha"),
+        ref_key=choose_key(("ref", "sha", "commit"), "ref"),
+        path_key=choose_key(("path", "filePath"), "path"),
+        order_key=choose_key(("order", "direction"), "order"),
+        sort_key=choose_key(("sort",), "sort"),
+        page_key=choose_key(("page",), "page"),
+    )
+
+
+def _adapt_arguments(provider: str, tool_meta: Optional[Dict[str, Any]], intended_args: Dict[str, Any]) -> Dict[str, Any]:
+    plan = _adapter_plan(_extract_schema_keys(tool_meta))
+    keys_lower = plan.keys_lower
+
     args: Dict[str, Any] = {}
     if provider == "jira":
-        jql_key = choose_key(["jql", "query", "jqlQuery"], "jql")
-        max_key = choose_key(["maxResults", "max_results", "limit"], "maxResults")
+        jql_key = plan.jql_key
+        max_key = plan.max_key
         if "jql" in intended_args:
             args[jql_key] = intended_args["jql"]
         if "maxResults" in intended_args:
@@ -330,27 +557,22 @@ def _adapt_arguments(provider: str, tool_meta: Optional[Dict[str, Any]], intende
                 # Map common variants to schema keys when available
                 candidate = keys_lower.get(k.lower()) or k
                 # Handle camelCase <-> snake_case for common fields
-                if candidate == k and schema_keys:
-                    if k == "project_key" and "projectKey" in schema_keys:
-                        candidate = "projectKey"
-                    elif k == "projectKey" and "project_key" in schema_keys:
-                        candidate = "project_key"
-                    elif k == "issue_type" and "issueType" in schema_keys:
-                        candidate = "issueType"
-                    elif k == "issueType" and "issue_type" in schema_keys:
-                        candidate = "issue_type"
+                if candidate == k and plan.schema_key_set:
+                    alt = _JIRA_CASE_ALT.get(k)
+                    if alt and alt in plan.schema_key_set:
+                        candidate = alt
                 args[candidate] = v
     elif provider == "github":
-        query_key = choose_key(["query", "q"], "query")
-        per_page_key = choose_key(["perPage", "per_page", "limit"], "perPage")
-        owner_key = choose_key(["owner", "user", "org"], "owner")
-        repo_key = choose_key(["repo", "repository"], "repo")
-        sha_key = choose_key(["sha", "start_sha"], "sha")
-        ref_key = choose_key(["ref", "sha", "commit"], "ref")
-        path_key = choose_key(["path", "filePath"], "path")
-        order_key = choose_key(["order", "direction"], "order")
-        sort_key = choose_key(["sort"], "sort")
-        page_key = choose_key(["page"], "page")
+        query_key = plan.query_key
+        per_page_key = plan.per_page_key
+        owner_key = plan.owner_key
+        repo_key = plan.repo_key
+        sha_key = plan.sha_key
+        ref_key = plan.ref_key
+        path_key = plan.path_key
+        order_key = plan.order_key
+        sort_key = plan.sort_key
+        page_key = plan.page_key
 
         if "query" in intended_args:
             args[query_key] = intended_args["query"]
@@ -376,25 +598,21 @@ def _adapt_arguments(provider: str, tool_meta: Optional[Dict[str, Any]], intende
             args[page_key] = intended_args["page"]
 
         # Enforce repository scoping using GITHUB_REPO_URL if set
-        enforced_url = settings.GITHUB_REPO_URL.strip()
-        if enforced_url:
-            m = re.search(r"github\.com/([\w.-]+)/([\w.-]+)", enforced_url)
-            if m:
-                enforced_owner, enforced_repo = m.group(1), m.group(2)
-                # Ensure query includes repo qualifier
-                if query_key in args and isinstance(args[query_key], str):
-                    token = f"repo:{enforced_owner}/{enforced_repo}"
-                    if token not in args[query_key]:
-                        args[query_key] = f"{token} {args[query_key]}".strip()
-                # Set owner/repo arguments; schema filter will drop them if not accepted
-                args[owner_key] = enforced_owner
-                args[repo_key] = enforced_repo
+        if _ENFORCED_REPO:
+            enforced_owner, enforced_repo, token = _ENFORCED_REPO
+            # Ensure query includes repo qualifier
+            if query_key in args and isinstance(args[query_key], str):
+                if token not in args[query_key]:
+                    args[query_key] = f"{token} {args[query_key]}".strip()
+            # Set owner/repo arguments; schema filter will drop them if not accepted
+            args[owner_key] = enforced_owner
+            args[repo_key] = enforced_repo
     else:
         args = dict(intended_args)
 
     # If we know the schema keys, drop extras not present to avoid validation errors
-    if schema_keys:
-        args = {k: v for k, v in args.items() if k in schema_keys}
+    if plan.schema_key_set:
+        args = {k: v for k, v in args.items() if k in plan.schema_key_set}
 
     return args
 
@@ -403,12 +621,21 @@ async def _plan(user_message: str, available_tools: Dict[str, List[Dict[str, Any
     """Produce a simple plan consisting of tool calls with arguments."""
     tasks: List[Dict[str, Any]] = []
 
-    keywords = _extract_keywords(user_message)
-    logger.debug("Planner keywords: %s", keywords)
+    # Authoritative gate: callers normally check _needs_tools first, but a
+    # direct _plan call must not pay keyword/tool-resolution work for a
+    # message that cannot produce tasks.
+    if not _needs_tools(user_message):
+        return tasks
 
+    # Tokenize the lowercase message once; keyword extraction and the
+    # word-level intent gates below all reuse it.
     text_lower = user_message.lower()
-    logger.info("Planner user_message: %s", user_message)
-    logger.info("Planner text_lower: %s", text_lower)
+    words = _WORD_RE.findall(text_lower)
+    word_set = set(words)
+
+    keywords = _extract_keywords(user_message, words=words)
+    logger.debug("Planner keywords: %s", keywords)
+    logger.debug("Planner user_message: %s", user_message)
     # Provider filter based on user intent
     def _allowed_providers(text: str) -> set[str]:
         allowed: set[str] = {"jira", "github"}
@@ -423,7 +650,7 @@ async def _plan(user_message: str, available_tools: Dict[str, List[Dict[str, Any
         return allowed
 
     providers = _allowed_providers(text_lower)
-    logger.info("Provider filter: %s", sorted(list(providers)))
+    logger.debug("Provider filter: %s", sorted(providers))
 
     # Resolve tool names based on what's exposed by MCP servers
     jira_tools = available_tools.get("jira", [])
@@ -431,13 +658,13 @@ async def _plan(user_message: str, available_tools: Dict[str, List[Dict[str, Any
 
     # If the user explicitly asks to create a Jira bug/ticket, plan only the create step
     if "jira" in providers and _wants_direct_create(user_message):
-        jira_create_tool = _resolve_tool_name(
-            jira_tools,
+        jira_create_tool = registry.resolve(
+            "jira",
             preferred_names=["jira_create_issue", "create_issue", "createIssue"],
             required_tokens=["create", "issue"],
         )
         chosen_create_tool = jira_create_tool or "jira_create_issue"
-        create_meta = _find_tool_by_name(jira_tools, chosen_create_tool)
+        create_meta = registry.find("jira", chosen_create_tool)
         title, desc = _parse_title_description(user_message)
         summary = title or user_message[:100]
         description = desc or user_message
@@ -450,8 +677,8 @@ async def _plan(user_message: str, available_tools: Dict[str, List[Dict[str, Any
             "args": {"project_key": project_key, "summary": summary, "description": description, "issue_type": "Bug"},
         }]
 
-    jira_search_tool = _resolve_tool_name(
-        jira_tools,
+    jira_search_tool = registry.resolve(
+        "jira",
         preferred_names=[
             "search_issues",
             "searchIssues",
@@ -463,8 +690,8 @@ async def _plan(user_message: str, available_tools: Dict[str, List[Dict[str, Any
     if not jira_search_tool:
         logger.warning("No Jira search issues tool found; available=%s", [t.get("name") for t in jira_tools])
 
-    gh_search_tool = _resolve_tool_name(
-        gh_tools,
+    gh_search_tool = registry.resolve(
+        "github",
         preferred_names=[
             "search_issues",  # GitHub search API returns issues & PRs
             "searchIssues",
@@ -473,8 +700,8 @@ async def _plan(user_message: str, available_tools: Dict[str, List[Dict[str, Any
     )
     if not gh_search_tool:
         # try a PR specific tool name variant
-        gh_search_tool = _resolve_tool_name(
-            gh_tools,
+        gh_search_tool = registry.resolve(
+            "github",
             preferred_names=["search_pull_requests", "searchPullRequests"],
             required_tokens=["search", "pull"],
         )
@@ -482,32 +709,30 @@ async def _plan(user_message: str, available_tools: Dict[str, List[Dict[str, Any
         logger.warning("No GitHub search tool found; available=%s", [t.get("name") for t in gh_tools])
 
     # Additional GitHub tools resolution
-    gh_repo_search_tool = _resolve_tool_name(
-        gh_tools,
+    gh_repo_search_tool = registry.resolve(
+        "github",
         preferred_names=["search_repositories", "searchRepositories"],
         required_tokens=["search", "repo"],
     )
-    gh_list_commits_tool = _resolve_tool_name(
-        gh_tools,
+    gh_list_commits_tool = registry.resolve(
+        "github",
         preferred_names=["list_commits", "listCommits"],
         required_tokens=["commit"],
     )
-    gh_get_commit_tool = _resolve_tool_name(
-        gh_tools,
+    gh_get_commit_tool = registry.resolve(
+        "github",
         preferred_names=["get_commit", "getCommit"],
         required_tokens=["commit"],
     )
 
-    # JIRA plan: build filter then add ORDER BY once
-    jql_filter: Optional[str]
+    # JIRA plan: build the full query (filter + ordering) in one pass
+    jql: Optional[str]
     if "all tasks" in text_lower or ("tasks" in text_lower and len(keywords) <= 2):
-        jql_filter = 'issuetype in ("Task","Story","Bug","Epic")'
+        jql = '(issuetype in ("Task","Story","Bug","Epic")) ORDER BY updated DESC'
     else:
-        jql_terms = [f'(summary ~ "{kw}" OR description ~ "{kw}")' for kw in keywords]
-        jql_filter = " OR ".join(jql_terms) if jql_terms else None
-    jira_meta = _find_tool_by_name(jira_tools, jira_search_tool)
-    if ("jira" in providers) and jql_filter and jira_search_tool:
-        jql = f"({jql_filter}) ORDER BY updated DESC"
+        jql = _build_jql(keywords)
+    jira_meta = registry.find("jira", jira_search_tool)
+    if ("jira" in providers) and jql and jira_search_tool:
         logger.debug("Planner JQL (final): %s", jql)
         tasks.append({
             "provider": "jira",
@@ -517,18 +742,10 @@ async def _plan(user_message: str, available_tools: Dict[str, List[Dict[str, Any
         })
 
     # GitHub plan - search pull requests/issues mentioning the keywords
-    gh_meta = _find_tool_by_name(gh_tools, gh_search_tool)
-    issue_pr_intent = any(
-        k in text_lower for k in (
-            "issue",
-            "issues",
-            "pr",
-            "pull request",
-            "pull requests",
-        )
-    )
+    gh_meta = registry.find("github", gh_search_tool)
+    issue_pr_intent = not word_set.isdisjoint(_ISSUE_PR_TOKENS)
     # Detect if user referenced a specific commit by SHA and intent
-    sha_match = re.search(r"\b[0-9a-f]{7,40}\b", text_lower)
+    sha_match = _SHA_RE.search(text_lower)
     specific_commit_intent = bool(sha_match) and any(
         phrase in text_lower for phrase in (
             "this commit",
@@ -558,8 +775,8 @@ async def _plan(user_message: str, available_tools: Dict[str, List[Dict[str, Any
         })
 
     # GitHub plan - search repositories
-    gh_repo_meta = _find_tool_by_name(gh_tools, gh_repo_search_tool)
-    if ("github" in providers) and gh_repo_search_tool and ("repositories" in text_lower or "repos" in text_lower or "list repos" in text_lower):
+    gh_repo_meta = registry.find("github", gh_repo_search_tool)
+    if ("github" in providers) and gh_repo_search_tool and not word_set.isdisjoint(_REPO_LIST_TOKENS):
         repo_query = " ".join(keywords) or "stars:>1"
         logger.debug("Planner GitHub repo query: %s", repo_query)
         tasks.append({
@@ -570,11 +787,11 @@ async def _plan(user_message: str, available_tools: Dict[str, List[Dict[str, Any
         })
 
     # GitHub plan - list commits for a repository
-    gh_list_commits_meta = _find_tool_by_name(gh_tools, gh_list_commits_tool)
-    logger.info("Planner gh_list_commits_meta: %s", gh_list_commits_tool)
-    if ("github" in providers) and gh_list_commits_tool and ("commits" in text_lower or "commit history" in text_lower or "history" in text_lower) and not specific_commit_intent:
+    gh_list_commits_meta = registry.find("github", gh_list_commits_tool)
+    logger.debug("Planner gh_list_commits_tool: %s", gh_list_commits_tool)
+    if ("github" in providers) and gh_list_commits_tool and not word_set.isdisjoint(_COMMIT_LIST_TOKENS) and not specific_commit_intent:
         repos = _parse_repo_filters(user_message)
-        logger.info("Planner repos: %s", repos)
+        logger.debug("Planner repos: %s", repos)
         if repos:
             try:
                 owner, repo_name = repos[0].split("/", 1)
@@ -588,7 +805,7 @@ async def _plan(user_message: str, available_tools: Dict[str, List[Dict[str, Any
                 logger.warning("Unable to parse owner/repo from repo filter: %s", repos[0])
 
     # GitHub plan - get a specific commit by SHA/ref (only when explicitly asked)
-    gh_get_commit_meta = _find_tool_by_name(gh_tools, gh_get_commit_tool)
+    gh_get_commit_meta = registry.find("github", gh_get_commit_tool)
     if ("github" in providers) and gh_get_commit_tool and specific_commit_intent:
         repos = _parse_repo_filters(user_message)
         if sha_match and repos:
@@ -603,34 +820,100 @@ async def _plan(user_message: str, available_tools: Dict[str, List[Dict[str, Any
                 })
             except ValueError:
                 logger.warning("Unable to parse owner/repo for get_commit from: %s", repos[0])
-    logger.info("Planner tasks: %s", tasks)
-    return tasks
+    # Drop duplicate (provider, tool, args) tasks so _execute never issues
+    # the same RPC twice in one plan
+    seen_keys: set[str] = set()
+    deduped: List[Dict[str, Any]] = []
+    for t in tasks:
+        k = f"{t['provider']}|{t['tool']}|{json.dumps(t['args'], sort_keys=True, default=str)}"
+        if k not in seen_keys:
+            seen_keys.add(k)
+            deduped.append(t)
+    if logger.isEnabledFor(logging.DEBUG):
+        # meta carries full tool schemas; keep it out of the log payload
+        logger.debug(
+            "Planner tasks: %s",
+            [{k: v for k, v in t.items() if k != "meta"} for t in deduped],
+        )
+    return deduped
+
+
+# Results of stateless read tools are cached briefly so repeated queries
+# skip the MCP round-trip entirely. Mutating tools (create/update/...)
+# always bypass the cache.
+_TOOL_RESULT_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=60)
+_CACHE_SAFE_TOKENS = ("search", "list", "get")
+_CACHE_UNSAFE_TOKENS = ("create", "update", "delete", "add", "merge", "push")
+
+
+def _is_cacheable_tool(tool_name: Optional[str]) -> bool:
+    name = str(tool_name or "").lower()
+    return any(tok in name for tok in _CACHE_SAFE_TOKENS) and not any(
+        tok in name for tok in _CACHE_UNSAFE_TOKENS
+    )
+
+
+def invalidate_tool_result_cache() -> None:
+    """Drop cached tool results (e.g. alongside registry invalidation)."""
+    _TOOL_RESULT_CACHE.clear()
+
+
+async def _dispatch_tool(provider: str, tool_name: str, adapted: Dict[str, Any]) -> Any:
+    if provider == "jira":
+        logger.debug("Calling Jira tool %s with args %s", tool_name, adapted)
+        return await jira_mcp_client.call_tool(tool_name, arguments=adapted)
+    logger.debug("Calling GitHub tool %s with args %s", tool_name, adapted)
+    # Acquire a pooled session per call: stdio transports are not safe for
+    # concurrent writes, and the pool's per-session lock serializes frames
+    # while still letting the batch fan out across pool members.
+    async with mcp_pool.acquire("github") as session:
+        raw = await session.call_tool(name=tool_name, arguments=adapted)
+    return _unwrap_mcp_result(raw)
+
+
+async def _call_tool_cached(provider: str, tool_name: str, adapted: Dict[str, Any]) -> Any:
+    key = None
+    if _is_cacheable_tool(tool_name):
+        try:
+            key = (provider, tool_name, json.dumps(adapted, sort_keys=True, default=str))
+        except (TypeError, ValueError):
+            key = None
+    if key is not None:
+        try:
+            return _TOOL_RESULT_CACHE[key]
+        except KeyError:
+            pass
+    result = await _dispatch_tool(provider, tool_name, adapted)
+    if key is not None:
+        _TOOL_RESULT_CACHE[key] = result
+    return result
+
+
+async def _guarded(sem: asyncio.Semaphore, provider: str, tool_name: str, adapted: Dict[str, Any]) -> Any:
+    async with sem:
+        return await _call_tool_cached(provider, tool_name, adapted)
 
 
 async def _execute(tasks: List[Dict[str, Any]]) -> List[Any]:
-    calls: List[asyncio.Future] = []
+    calls: List[Any] = []
+    # Bound in-flight calls per MCP server so a large plan does not flood
+    # the stdio subprocess; each provider gets its own window.
+    semaphores = {
+        "jira": asyncio.Semaphore(settings.MCP_MAX_CONCURRENCY),
+        "github": asyncio.Semaphore(settings.MCP_MAX_CONCURRENCY),
+    }
 
     for t in tasks:
         provider = t.get("provider")
         tool_name = t.get("tool")
-        logger.info("Orchestrator tool name: %s", tool_name)
+        logger.debug("Orchestrator tool name: %s", tool_name)
         args = t.get("args", {})
 
-        if provider == "jira":
+        if provider in ("jira", "github"):
             adapted = _adapt_arguments(provider, t.get("meta"), args)
-            logger.info("Calling Jira tool %s with args %s", tool_name, adapted)
-            calls.append(jira_mcp_client.call_tool(tool_name, arguments=adapted))
-        elif provider == "github":
-            meta = t.get("meta")
-            async def _call_github(name: str, arguments: Dict[str, Any], _meta: Optional[Dict[str, Any]]):
-                client = await github_mcp_client._ensure_client()  # pylint: disable=protected-access
-                session = client.get_session("github")
-                adapted = _adapt_arguments("github", _meta, arguments)
-                logger.info("Calling GitHub tool %s with args %s", name, adapted)
-                raw = await session.call_tool(name=name, arguments=adapted)
-                return _unwrap_mcp_result(raw)
-
-            calls.append(_call_github(tool_name, args, meta))
+            calls.append(
+                _guarded(semaphores[provider], provider, tool_name, adapted)
+            )
         else:
             logger.warning("Unknown provider in task: %s", provider)
 
@@ -638,129 +921,188 @@ async def _execute(tasks: List[Dict[str, Any]]) -> List[Any]:
     return results
 
 
-def _aggregate(tasks: List[Dict[str, Any]], results: List[Any]) -> Tuple[str, List[Dict[str, str]]]:
-    """Summarize results and prepare sources."""
-    lines: List[str] = []
-    sources: List[Dict[str, str]] = []
-    structured: Dict[str, Any] = {}
+def _normalize_jira_issue(raw: Dict[str, Any]) -> Dict[str, Any]:
+    # Some create endpoints return { message, issue: { ... } }
+    if isinstance(raw.get("issue"), dict):
+        raw = raw["issue"]  # type: ignore[assignment]
+
+    issue_id = raw.get("id") or raw.get("issue_id")
+    issue_key = raw.get("key")
+    # fields may be top-level or under 'fields'
+    fields = raw.get("fields") if isinstance(raw.get("fields"), dict) else {}
+    summary = raw.get("summary") or fields.get("summary") or ""
+    description = raw.get("description") or fields.get("description") or ""
+    # Prefer browse URL if we have a key and base URL; otherwise fall back to API links
+    browse_url = f"{settings.JIRA_URL.rstrip('/')}/browse/{issue_key}" if settings.JIRA_URL and issue_key else ""
+    url = browse_url or raw.get("self") or raw.get("url") or ""
+    return {
+        "id": issue_id,
+        "key": issue_key,
+        "summary": summary,
+        "description": description,
+        "url": url,
+    }
 
-    def _jira_issues_from_payload(payload: Any) -> List[Dict[str, Any]]:
-        def normalize_issue(raw: Dict[str, Any]) -> Dict[str, Any]:
-            # Some create endpoints return { message, issue: { ... } }
-            if isinstance(raw.get("issue"), dict):
-                raw = raw["issue"]  # type: ignore[assignment]
-
-            issue_id = raw.get("id") or raw.get("issue_id")
-            issue_key = raw.get("key")
-            # fields may be top-level or under 'fields'
-            fields = raw.get("fields") if isinstance(raw.get("fields"), dict) else {}
-            summary = raw.get("summary") or fields.get("summary") or ""
-            description = raw.get("description") or fields.get("description") or ""
-            # Prefer browse URL if we have a key and base URL; otherwise fall back to API links
-            browse_url = f"{settings.JIRA_URL.rstrip('/')}/browse/{issue_key}" if settings.JIRA_URL and issue_key else ""
-            url = browse_url or raw.get("self") or raw.get("url") or ""
-            return {
-                "id": issue_id,
-                "key": issue_key,
-                "summary": summary,
-                "description": description,
-                "url": url,
-            }
 
-        issues_list: List[Dict[str, Any]] = []
-        if isinstance(payload, list):
-            # pattern: [ { total, issues: [...] } ]
-            for entry in payload:
+def _jira_issues_from_payload(payload: Any) -> List[Dict[str, Any]]:
+    issues_list: List[Dict[str, Any]] = []
+    if isinstance(payload, list):
+        # pattern: [ { total, issues: [...] } ]
+        for entry in payload:
+            if isinstance(entry, dict) and isinstance(entry.get("issues"), list):
+                for it in entry["issues"]:
+                    if isinstance(it, dict):
+                        issues_list.append(_normalize_jira_issue(it))
+    elif isinstance(payload, dict):
+        # Handle wrapped search results under 'items' → [{ issues: [...] }]
+        if isinstance(payload.get("items"), list):
+            for entry in payload["items"]:
                 if isinstance(entry, dict) and isinstance(entry.get("issues"), list):
                     for it in entry["issues"]:
                         if isinstance(it, dict):
-                            issues_list.append(normalize_issue(it))
-        elif isinstance(payload, dict):
-            # Handle wrapped search results under 'items' → [{ issues: [...] }]
-            if isinstance(payload.get("items"), list):
-                for entry in payload["items"]:
-                    if isinstance(entry, dict) and isinstance(entry.get("issues"), list):
-                        for it in entry["issues"]:
-                            if isinstance(it, dict):
-                                issues_list.append(normalize_issue(it))
-            if isinstance(payload.get("issues"), list):
-                for it in payload["issues"]:
-                    if isinstance(it, dict):
-                        issues_list.append(normalize_issue(it))
-            elif isinstance(payload.get("issue"), dict):
-                issues_list.append(normalize_issue(payload["issue"]))
-            else:
-                # maybe already a single issue
-                issues_list.append(normalize_issue(payload))
-        return issues_list
-
-    # --- GitHub normalizers ---
-    def _github_search_items(payload: Any) -> List[Dict[str, Any]]:
-        if isinstance(payload, dict):
-            items = payload.get("items")
-            if isinstance(items, list):
-                return [i for i in items if isinstance(i, dict)]
-        if isinstance(payload, list):
-            # Sometimes raw list of items is returned
-            return [i for i in payload if isinstance(i, dict)]
-        return []
+                            issues_list.append(_normalize_jira_issue(it))
+        if isinstance(payload.get("issues"), list):
+            for it in payload["issues"]:
+                if isinstance(it, dict):
+                    issues_list.append(_normalize_jira_issue(it))
+        elif isinstance(payload.get("issue"), dict):
+            issues_list.append(_normalize_jira_issue(payload["issue"]))
+        else:
+            # maybe already a single issue
+            issues_list.append(_normalize_jira_issue(payload))
+    return issues_list
+
+
+# --- GitHub normalizers ---
+def _github_search_items(payload: Any) -> List[Dict[str, Any]]:
+    if isinstance(payload, dict):
+        items = payload.get("items")
+        if isinstance(items, list):
+            return [i for i in items if isinstance(i, dict)]
+    if isinstance(payload, list):
+        # Sometimes raw list of items is returned
+        return [i for i in payload if isinstance(i, dict)]
+    return []
 
-    def _github_issues_from_payload(payload: Any) -> List[Dict[str, Any]]:
-        items = _github_search_items(payload)
-        results_: List[Dict[str, Any]] = []
-        for it in items:
-            url = it.get("html_url") or it.get("url") or ""
-            results_.append({
-                "id": it.get("id"),
-                "number": it.get("number"),
-                "title": it.get("title"),
-                "state": it.get("state"),
-                "url": url,
-            })
-        return results_
-
-    def _github_repos_from_payload(payload: Any) -> List[Dict[str, Any]]:
-        items = _github_search_items(payload)
-        results_: List[Dict[str, Any]] = []
-        for it in items:
-            url = it.get("html_url") or it.get("url") or ""
-            results_.append({
-                "id": it.get("id"),
-                "name": it.get("name"),
-                "full_name": it.get("full_name"),
-                "description": it.get("description"),
-                "url": url,
-                "stargazers_count": it.get("stargazers_count"),
-            })
-        return results_
-
-    def _github_commits_from_payload(payload: Any) -> List[Dict[str, Any]]:
-        items: List[Dict[str, Any]] = []
-        if isinstance(payload, list):
-            items = [i for i in payload if isinstance(i, dict)]
-        elif isinstance(payload, dict):
-            # Some tools wrap in a dict key; try common variants
-            for key in ("commits", "items", "results"):
-                if isinstance(payload.get(key), list):
-                    items = [i for i in payload.get(key) if isinstance(i, dict)]
-                    break
-
-        results_: List[Dict[str, Any]] = []
-        for it in items:
-            commit = it.get("commit") if isinstance(it.get("commit"), dict) else {}
-            author = commit.get("author") if isinstance(commit.get("author"), dict) else {}
-            url = it.get("html_url") or it.get("url") or ""
-            results_.append({
-                "sha": it.get("sha"),
-                "message": commit.get("message"),
-                "author": author.get("name"),
-                "date": author.get("date"),
-                "url": url,
-            })
-        return results_
+
+def _github_issues_from_payload(payload: Any) -> List[Dict[str, Any]]:
+    items = _github_search_items(payload)
+    results_: List[Dict[str, Any]] = []
+    for it in items:
+        url = it.get("html_url") or it.get("url") or ""
+        results_.append({
+            "id": it.get("id"),
+            "number": it.get("number"),
+            "title": it.get("title"),
+            "state": it.get("state"),
+            "url": url,
+        })
+    return results_
+
+
+def _github_repos_from_payload(payload: Any) -> List[Dict[str, Any]]:
+    items = _github_search_items(payload)
+    results_: List[Dict[str, Any]] = []
+    for it in items:
+        url = it.get("html_url") or it.get("url") or ""
+        results_.append({
+            "id": it.get("id"),
+            "name": it.get("name"),
+            "full_name": it.get("full_name"),
+            "description": it.get("description"),
+            "url": url,
+            "stargazers_count": it.get("stargazers_count"),
+        })
+    return results_
+
+
+def _github_commits_from_payload(payload: Any) -> List[Dict[str, Any]]:
+    items: List[Dict[str, Any]] = []
+    if isinstance(payload, list):
+        items = [i for i in payload if isinstance(i, dict)]
+    elif isinstance(payload, dict):
+        # Some tools wrap in a dict key; try common variants
+        for key in ("commits", "items", "results"):
+            if isinstance(payload.get(key), list):
+                items = [i for i in payload.get(key) if isinstance(i, dict)]
+                break
+
+    results_: List[Dict[str, Any]] = []
+    for it in items:
+        commit = it.get("commit") if isinstance(it.get("commit"), dict) else {}
+        author = commit.get("author") if isinstance(commit.get("author"), dict) else {}
+        url = it.get("html_url") or it.get("url") or ""
+        results_.append({
+            "sha": it.get("sha"),
+            "message": commit.get("message"),
+            "author": author.get("name"),
+            "date": author.get("date"),
+            "url": url,
+        })
+    return results_
+
+
+def _github_commit_from_payload(payload: Any) -> List[Dict[str, Any]]:
+    # Single commit object from get_commit
+    return _github_commits_from_payload([payload] if isinstance(payload, dict) else [])
+
+
+# Dispatch table for GitHub result normalization, keyed by the tool name
+# canonicalized to lowercase with underscores stripped. Exact dict lookup
+# replaces the old chain of substring tests on every result.
+_GH_DISPATCH: Dict[str, Tuple[str, Any]] = {
+    "searchissues": ("github_issues", _github_issues_from_payload),
+    "searchrepositories": ("github_repositories", _github_repos_from_payload),
+    "listcommits": ("github_commits", _github_commits_from_payload),
+    "getcommit": ("github_commits", _github_commit_from_payload),
+}
+
+
+def _gh_dispatch_lookup(tool: str) -> Optional[Tuple[str, Any]]:
+    key = tool.lower().replace("_", "")
+    entry = _GH_DISPATCH.get(key)
+    if entry is not None:
+        return entry
+    # Servers sometimes prefix tool names; fall back to substring match only
+    # when the exact lookup misses.
+    for needle, entry in _GH_DISPATCH.items():
+        if needle in key:
+            return entry
+    return None
+
+
+def _pick_source_fields(item: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Extract (title, url, preview) for a source entry with each key read once."""
+    get = item.get
+    body = get("body")
+    fields = get("fields")
+    commit = get("commit")
+    title = get("title") or get("key") or get("name") or get("message") or "item"
+    url = get("html_url") or get("url") or get("self") or ""
+    preview = (
+        (body if isinstance(body, str) else "")
+        or (fields.get("summary") if isinstance(fields, dict) else "")
+        or (commit.get("message") if isinstance(commit, dict) else "")
+        or ""
+    )
+    return title, url, preview
+
+
+def _aggregate(tasks: List[Dict[str, Any]], results: List[Any]) -> Tuple[Any, List[Dict[str, str]]]:
+    """Summarize results and prepare sources.
+
+    Returns the structured dict when one was built (serialized downstream),
+    otherwise a plain-text summary string.
+    """
+    lines: List[str] = []
+    sources: List[Dict[str, str]] = []
+    structured: Dict[str, Any] = {}
 
     for t, r in zip(tasks, results):
-        label = f"{t.get('provider')}.{t.get('tool')}"
+        # Loop-invariant task fields, bound once per result
+        provider = t.get("provider")
+        tool = t.get("tool")
+        label = f"{provider}.{tool}"
         if isinstance(r, Exception):
             lines.append(f"{label}: error {r}")
             continue
@@ -774,30 +1116,18 @@ def _aggregate(tasks: List[Dict[str, Any]], results: List[Any]) -> Tuple[str, Li
         lines.append(f"{label}: {count} results")
 
         # Provider-specific normalization for structured output
-        if t.get("provider") == "jira":
+        if provider == "jira":
             jira_issues = _jira_issues_from_payload(r)
             if jira_issues:
                 structured.setdefault("jira_issues", []).extend(jira_issues)
-                logger.info("structured: %s", structured)
-        elif t.get("provider") == "github":
-            tool = str(t.get("tool") or "").lower()
-            if "search_issues" in tool:
-                gh_issues = _github_issues_from_payload(r)
-                if gh_issues:
-                    structured.setdefault("github_issues", []).extend(gh_issues)
-            elif "search_repositories" in tool or "searchrepositories" in tool:
-                gh_repos = _github_repos_from_payload(r)
-                if gh_repos:
-                    structured.setdefault("github_repositories", []).extend(gh_repos)
-            elif "list_commits" in tool or "listcommits" in tool:
-                gh_commits = _github_commits_from_payload(r)
-                if gh_commits:
-                    structured.setdefault("github_commits", []).extend(gh_commits)
-            elif "get_commit" in tool or "getcommit" in tool:
-                # Single commit object
-                commits_one = _github_commits_from_payload([r] if isinstance(r, dict) else [])
-                if commits_one:
-                    structured.setdefault("github_commits", []).extend(commits_one)
+                logger.debug("structured: %s", structured)
+        elif provider == "github":
+            entry = _gh_dispatch_lookup(str(tool or ""))
+            if entry is not None:
+                structured_key, handler = entry
+                normalized = handler(r)
+                if normalized:
+                    structured.setdefault(structured_key, []).extend(normalized)
 
         # Collect top sources mapped to ChatResponse.SourceInfo
         items_for_sources: List[Dict[str, Any]] = []
@@ -808,42 +1138,30 @@ def _aggregate(tasks: List[Dict[str, Any]], results: List[Any]) -> Tuple[str, Li
             items_for_sources = r["issues"]
         else:
             # Fallback to structured aggregates built above
-            if t.get("provider") == "jira":
+            if provider == "jira":
                 items_for_sources = structured.get("jira_issues", [])  # type: ignore[assignment]
-            elif t.get("provider") == "github":
+            elif provider == "github":
                 items_for_sources = (
                     structured.get("github_issues", [])  # type: ignore[assignment]
                     or structured.get("github_repositories", [])  # type: ignore[assignment]
                     or structured.get("github_commits", [])  # type: ignore[assignment]
                 )
 
-        for idx, item in enumerate(items_for_sources[:5], start=1):
-            # Prefer meaningful titles depending on item type
-            title = item.get("title") or item.get("key") or item.get("name") or item.get("message") or "item"
-            url = (
-                item.get("html_url")
-                or item.get("url")
-                or item.get("self")
-                or ""
-            )
-            preview = (
-                (item.get("body") if isinstance(item.get("body"), str) else "")
-                or (item.get("fields", {}).get("summary") if isinstance(item.get("fields"), dict) else "")
-                or (item.get("commit", {}).get("message") if isinstance(item.get("commit"), dict) else "")
-                or ""
-            )
-            sources.append({
+        sources.extend(
+            {
                 "chunk_id": idx,
                 "source": str(url or title),
                 "content_preview": str(preview)[:200],
-            })
+            }
+            for idx, (title, url, preview) in enumerate(
+                (_pick_source_fields(item) for item in items_for_sources[:5]), start=1
+            )
+        )
 
-    # Prefer structured JSON if we built it; otherwise textual summary
+    # Prefer the structured dict if we built it; otherwise textual summary.
+    # The dict is handed to the refiner as-is and serialized only once there.
     if structured:
-        try:
-            return json.dumps(structured, ensure_ascii=False), sources
-        except (TypeError, ValueError):
-            pass
+        return structured, sources
 
     answer = "\n".join(lines) if lines else "No results found."
     return answer, sources
@@ -868,8 +1186,12 @@ async def orchestrate(user_message: str) -> Dict[str, Any]:
         return {"output": None}
 
     results = await _execute(tasks)
-    logger.info("Orchestrator results: %s", results)
+    logger.debug("Orchestrator results: %s", results)
     output, sources = _aggregate(tasks, results)
+    if isinstance(output, dict):
+        # Structured payload: pass the object through so the refiner
+        # serializes it exactly once instead of dumps/loads/dumps.
+        return {"output": None, "output_obj": output, "sources": sources}
     return {"output": output, "sources": sources}
 
 
@@ -881,14 +1203,27 @@ def _unwrap_mcp_result(call_result: Any) -> Any:
     """
     if isinstance(call_result, (list, dict)):
         return call_result
+    # Fast path for the stable mcp_use shape: content[0].text holding JSON.
+    # Direct attribute access beats getattr probing; odd shapes fall through.
+    try:
+        text_value = call_result.content[0].text
+    except (AttributeError, IndexError, TypeError):
+        pass
+    else:
+        if isinstance(text_value, str):
+            try:
+                return jsonfast.loads(text_value)
+            except (ValueError, TypeError):
+                return text_value
     content_list = getattr(call_result, "content", None)
     if isinstance(content_list, list) and content_list:
         first_item = content_list[0]
         text_value = getattr(first_item, "text", None)
-        logger.info("Text value: %s", text_value)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Text value: %.2000s", text_value)
         if isinstance(text_value, str):
             try:
-                return json.loads(text_value)
+                return jsonfast.loads(text_value)
             except (ValueError, TypeError):
                 return text_value
         json_attr = getattr(first_item, "json", None)
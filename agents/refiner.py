@@ -1,8 +1,9 @@
 import json
 import logging
-from typing import Any, Dict, Tuple
+import re
+from typing import Any, Dict, Optional, Tuple
 
-from config import LLMConfig
+from config import get_llm
 
 
 logger = logging.getLogger(__name__)
@@ -40,68 +41,181 @@ JIRA_REFINE_PROMPT = (
 )
 
 
+_FALLBACK_REFINE_PROMPT = (
+    "You are a helpful assistant that refines raw tool outputs into concise, factual context.\n"
+    "Given the user's request and the tool outputs below, produce a short, neutral, skimmable result.\n"
+    "- Do not invent facts.\n"
+    "- Prefer bullet points listing key fields.\n\n"
+    "User request:\n{user}\n\n"
+    "Tool outputs (raw):\n{raw}\n\n"
+    "Output:"
+)
+
+# Provider -> prompt template; one lookup replaces the if/elif chain.
+_PROMPTS = {
+    "github": GITHUB_REFINE_PROMPT,
+    "jira": JIRA_REFINE_PROMPT,
+}
+
+
+def _detect_provider(payload: Dict[str, Any]) -> str:
+    for k in payload.keys():
+        lk = str(k).lower()
+        if lk.startswith("github_"):
+            return "github"
+        if lk.startswith("jira_"):
+            return "jira"
+    return "unknown"
+
+
+# Structured payloads always open with a provider-prefixed key; checking for
+# it up front avoids a full json.loads on strings that cannot match.
+_PROVIDER_HINT_RE = re.compile(r'\s*\{\s*"(?:github|jira)_')
+
+
 def _detect_provider_and_payload(output_str: str) -> Tuple[str, Dict[str, Any]]:
+    if not _PROVIDER_HINT_RE.match(output_str):
+        return "unknown", {}
     try:
         parsed = json.loads(output_str)
         if isinstance(parsed, dict):
-            for k in parsed.keys():
-                lk = str(k).lower()
-                if lk.startswith("github_"):
-                    return "github", parsed
-                if lk.startswith("jira_"):
-                    return "jira", parsed
+            provider = _detect_provider(parsed)
+            if provider != "unknown":
+                return provider, parsed
         return "unknown", {}
     except json.JSONDecodeError:  # json parsing fallback
         return "unknown", {}
 
 
+# Simple enumeration intents where a deterministic rendering matches what the
+# LLM would produce, letting us skip the refine round-trip entirely.
+_LIST_INTENT_RE = re.compile(r"\b(list|show|display|all|every)\b", re.IGNORECASE)
+
+_MAX_LIST_ITEMS = 20
+
+
+def _first_line(text: Any) -> str:
+    return str(text or "").strip().split("\n", 1)[0]
+
+
+def _format_github_deterministic(data: Dict[str, Any]) -> Optional[str]:
+    """Render enumerable GitHub data with the same rules the LLM prompt states.
+
+    Returns None when the payload has no recognizable list, so the caller
+    falls back to the LLM.
+    """
+    lines = []
+    commits = data.get("github_commits")
+    if isinstance(commits, list) and commits:
+        for it in commits[:_MAX_LIST_ITEMS]:
+            if not isinstance(it, dict):
+                continue
+            sha = str(it.get("sha") or "")[:7]
+            lines.append(
+                f"- {sha} {_first_line(it.get('message'))} — {it.get('author') or ''}, "
+                f"{it.get('date') or ''} — {it.get('url') or ''}"
+            )
+        if len(commits) > _MAX_LIST_ITEMS:
+            lines.append("... and more")
+        return "\n".join(lines)
+
+    repos = data.get("github_repositories")
+    if isinstance(repos, list) and repos:
+        for it in repos[:_MAX_LIST_ITEMS]:
+            if not isinstance(it, dict):
+                continue
+            desc = str(it.get("description") or "")[:120]
+            lines.append(
+                f"- {it.get('full_name') or it.get('name') or ''} — {desc} — "
+                f"{it.get('stargazers_count') or 0} stars — {it.get('url') or ''}"
+            )
+        if len(repos) > _MAX_LIST_ITEMS:
+            lines.append("... and more")
+        return "\n".join(lines)
+
+    issues = data.get("github_issues")
+    if isinstance(issues, list) and issues:
+        for it in issues[:_MAX_LIST_ITEMS]:
+            if not isinstance(it, dict):
+                continue
+            lines.append(
+                f"- #{it.get('number') or ''} {_first_line(it.get('title'))} "
+                f"[{it.get('state') or ''}] — {it.get('url') or ''}"
+            )
+        if len(issues) > _MAX_LIST_ITEMS:
+            lines.append("... and more")
+        return "\n".join(lines)
+
+    return None
+
+
+def _dumps_streaming(data: Any) -> str:
+    """Serialize via iterencode so no intermediate monolithic buffers pile up."""
+    return "".join(json.JSONEncoder(ensure_ascii=False).iterencode(data))
+
+
 def refine_tool_result(tool_result: Dict[str, Any], user_message: str) -> str:
     try:
-        raw = tool_result.get("output")
-        if not isinstance(raw, str):
-            raw = str(raw)
-
-        provider, data = _detect_provider_and_payload(raw)
+        # Preferred path: the orchestrator hands the structured dict through
+        # untouched, so provider detection needs no parse and the payload is
+        # serialized exactly once, below, for the prompt.
+        output_obj = tool_result.get("output_obj")
+        raw: Optional[str] = None
+        if isinstance(output_obj, dict):
+            provider, data = _detect_provider(output_obj), output_obj
+        else:
+            raw = tool_result.get("output")
+            if not isinstance(raw, str):
+                raw = str(raw)
+            provider, data = _detect_provider_and_payload(raw)
 
         # Deterministic Jira formatting: enumerate all issues
         if provider == "jira" and isinstance(data, dict) and isinstance(data.get("jira_issues"), list):
             issues = data["jira_issues"]
-            lines = []
-            for it in issues:
-                if not isinstance(it, dict):
-                    continue
-                key = str(it.get("key") or "").strip()
-                summary = str(it.get("summary") or "").strip()
-                url = str(it.get("url") or "").strip()
-                if key or summary or url:
-                    lines.append(f"- [{key}] {summary} — {url}")
-            return "\n".join(lines) if lines else raw
-
-        # Deterministic GitHub formatting still goes through the prompt for field selection/limits
-        if provider == "github" and data:
-            prompt = GITHUB_REFINE_PROMPT.format(user=user_message, data=json.dumps(data, ensure_ascii=False))
-        elif provider == "jira" and data:
-            prompt = JIRA_REFINE_PROMPT.format(user=user_message, data=json.dumps(data, ensure_ascii=False))
+            # Single comprehension: the list is shaped in one pass instead of
+            # growing via repeated appends in a Python-level loop.
+            lines = [
+                f"- [{key}] {summary} — {url}"
+                for it in issues
+                if isinstance(it, dict)
+                for key, summary, url in (
+                    (
+                        str(it.get("key") or "").strip(),
+                        str(it.get("summary") or "").strip(),
+                        str(it.get("url") or "").strip(),
+                    ),
+                )
+                if key or summary or url
+            ]
+            if lines:
+                return "\n".join(lines)
+            return raw if raw is not None else _dumps_streaming(data)
+
+        # List-style requests with enumerable data render deterministically,
+        # skipping the LLM round-trip; ambiguous asks still go to the prompt.
+        if provider == "github" and data and _LIST_INTENT_RE.search(user_message):
+            rendered = _format_github_deterministic(data)
+            if rendered:
+                return rendered
+
+        prompt_tpl = _PROMPTS.get(provider)
+        if prompt_tpl and data:
+            # format_map skips the kwargs-dict repack that format(**kwargs) does
+            prompt = prompt_tpl.format_map({"user": user_message, "data": _dumps_streaming(data)})
         else:
             # Fallback to a simple neutral summary preserving key fields
-            fallback_prompt = (
-                "You are a helpful assistant that refines raw tool outputs into concise, factual context.\n"
-                "Given the user's request and the tool outputs below, produce a short, neutral, skimmable result.\n"
-                "- Do not invent facts.\n"
-                "- Prefer bullet points listing key fields.\n\n"
-                f"User request:\n{user_message}\n\n"
-                f"Tool outputs (raw):\n{raw}\n\n"
-                "Output:"
-            )
-            prompt = fallback_prompt
+            if raw is None:
+                raw = _dumps_streaming(output_obj)
+            prompt = _FALLBACK_REFINE_PROMPT.format_map({"user": user_message, "raw": raw})
 
-        response = LLMConfig.LLM_PROVIDER.invoke(prompt)
+        response = get_llm().invoke(prompt)
         content = getattr(response, "content", None)
         if isinstance(content, str) and content.strip():
             return content.strip()
-        return raw
+        return raw if raw is not None else _dumps_streaming(data)
     except Exception as exc:  # pylint: disable=broad-except
         logger.warning("Refine agent failed: %s", exc)
-        return str(tool_result.get("output", ""))
+        fallback = tool_result.get("output") or tool_result.get("output_obj", "")
+        return fallback if isinstance(fallback, str) else str(fallback)
 
 
@@ -1,53 +1,86 @@
 # api/chatbot_routes.py
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from chatbot.agent import chatbot_graph
 from chatbot.models import ChatRequest, ChatResponse
+from chatbot.prompt import rag_with_sources_stream
 from agents.refiner import refine_tool_result
 from agents.orchestrator import orchestrate
+from common import jsonfast
+import asyncio
 import logging
+import os
+from cachetools import TTLCache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/chatbot", tags=["Chatbot"])
 
+# Server-side history per session_id: the client sends only the new message
+# each turn instead of re-serializing the whole conversation. Only the most
+# recent window is fed to the agent so prompt size stays bounded.
+_SESSION_HISTORY: TTLCache = TTLCache(
+    maxsize=1000, ttl=float(os.getenv("CHAT_SESSION_TTL", "3600"))
+)
+_HISTORY_WINDOW = 20
+
+
+def _resolve_history(request: ChatRequest) -> list:
+    if request.session_id:
+        stored = _SESSION_HISTORY.get(request.session_id)
+        if stored is None:
+            stored = []
+            _SESSION_HISTORY[request.session_id] = stored
+        return stored
+    return [{"role": msg.role, "content": msg.content} for msg in request.history or []]
+
+
+def _record_exchange(session_id, message: str, reply: str) -> None:
+    stored = _SESSION_HISTORY.get(session_id)
+    if stored is not None:
+        stored.append({"role": "user", "content": message})
+        stored.append({"role": "assistant", "content": reply})
+
+
 @router.post("/", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     try:
+        history = _resolve_history(request)
         logger.info("Received chat request: %s", request.message)
-        logger.info("Conversation history length: %d", len(request.history or []))
-        
-        # Convert history to the format expected by the agent
-        conversation_history = []
-        if request.history:
-            for msg in request.history:
-                conversation_history.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
-        
-        # Add the current message
-        conversation_history.append({
-            "role": "user", 
-            "content": request.message
-        })
+        logger.info("Conversation history length: %d", len(history))
+
+        # Recent window first, current message last
+        conversation_history = history[-_HISTORY_WINDOW:] + [
+            {"role": "user", "content": request.message}
+        ]
         
         # Try tool-orchestrated workflow first (Jira/GitHub MCP). If present, refine and append as context.
         tool_result = await orchestrate(request.message)
-        logger.debug("Tool orchestrator result keys: %s", list(tool_result.keys()) if isinstance(tool_result, dict) else type(tool_result))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Tool orchestrator result keys: %s",
+                list(tool_result) if isinstance(tool_result, dict) else type(tool_result).__name__,
+            )
         extra_context = ""
-        if tool_result and tool_result.get("output"):
-            refined = refine_tool_result(tool_result, request.message)
+        if tool_result and (tool_result.get("output") or tool_result.get("output_obj")):
+            # Refinement may invoke the LLM synchronously; keep it off the loop
+            refined = await asyncio.to_thread(refine_tool_result, tool_result, request.message)
             extra_context = refined or ""
-            logger.info("Refined tool context: %s", extra_context)
-            logger.info("Appended refined tool context length=%d", len(extra_context))
+            logger.info(
+                "Appended refined tool context length=%d head=%.200s",
+                len(extra_context),
+                extra_context,
+            )
 
-        # Pass the full conversation to the chatbot with refined extra context
-        result = chatbot_graph.invoke({
+        # Pass the full conversation to the chatbot with refined extra context.
+        # The graph runs retrieval + LLM synchronously, so push it to a worker
+        # thread instead of stalling the event loop for every other route.
+        result = await asyncio.to_thread(chatbot_graph.invoke, {
             "input": request.message,
             "messages": conversation_history,
             "extra_context": extra_context
         })
         
-        logger.info("Graph result: %s", result)
+        logger.debug("Graph result: %s", result)
         
         if result is None:
             raise HTTPException(status_code=500, detail="Chatbot returned no response")
@@ -58,10 +91,49 @@ async def chat(request: ChatRequest):
         # Extract sources if available
         sources = result.get("sources", [])
         logger.info("Returning response with %d sources", len(sources))
-            
+
+        if request.session_id:
+            _record_exchange(request.session_id, request.message, result["output"])
+
         return ChatResponse(reply=result["output"], sources=sources)
     except HTTPException:
         raise  # Re-raise HTTPExceptions as-is
     except Exception as e:
         logger.error("Error in chatbot: %s", str(e))
         raise HTTPException(status_code=500, detail=f"Chatbot error: {str(e)}") from e
+
+
+@router.post("/stream")
+async def chat_stream(request: ChatRequest):
+    """Stream the answer as Server-Sent Events.
+
+    Sources are sent first as a JSON preamble event, then answer tokens
+    follow as they are generated, so time-to-first-token is roughly one
+    model round-trip instead of the full generation latency.
+    """
+    try:
+        logger.info("Received streaming chat request: %s", request.message)
+
+        tool_result = await orchestrate(request.message)
+        extra_context = ""
+        if tool_result and (tool_result.get("output") or tool_result.get("output_obj")):
+            refined = await asyncio.to_thread(refine_tool_result, tool_result, request.message)
+            extra_context = refined or ""
+
+        async def event_stream():
+            parts = []
+            async for kind, payload in rag_with_sources_stream(request.message, extra_context):
+                if kind == "sources":
+                    yield f"event: sources\ndata: {jsonfast.dumps(payload)}\n\n"
+                else:
+                    parts.append(payload)
+                    yield f"data: {jsonfast.dumps({'token': payload})}\n\n"
+            if request.session_id:
+                _resolve_history(request)  # create the session on first turn
+                _record_exchange(request.session_id, request.message, "".join(parts))
+            yield "event: done\ndata: {}\n\n"
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+    except Exception as e:
+        logger.error("Error in streaming chatbot: %s", str(e))
+        raise HTTPException(status_code=500, detail=f"Chatbot error: {str(e)}") from e
@@ -13,10 +13,9 @@ async def create_text_embedding(
     if not file.filename.endswith(".txt"):
         raise HTTPException(status_code=400, detail="Only .txt files are supported")
 
-    content = await file.read()
-    text = content.decode("utf-8")
-
-    result = service.embed_text(text, source=file.filename)
+    # Hand the spooled upload straight to the service; it reads and chunks
+    # incrementally instead of pulling the whole file into memory here.
+    result = service.embed_text_stream(file.file, source=file.filename)
     return {"filename": file.filename, **result}
 
 
@@ -28,6 +27,6 @@ async def create_pdf_embedding(
     if not file.filename.endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only .pdf files are supported")
 
-    pdf_bytes = await file.read()
-    result = service.embed_pdf(pdf_bytes, source=file.filename)
+    # PdfReader accepts file-like objects, so no full-bytes copy is needed.
+    result = service.embed_pdf_stream(file.file, source=file.filename)
     return {"filename": file.filename, **result}
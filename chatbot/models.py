@@ -14,6 +14,9 @@ class SourceInfo(BaseModel):
 class ChatRequest(BaseModel):
     message: str
     history: Optional[List[ChatMessage]] = []
+    # When set, history is kept server-side under this key and the client
+    # only sends the new message each turn
+    session_id: Optional[str] = None
 
 class ChatResponse(BaseModel):
     reply: str
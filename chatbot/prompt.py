@@ -1,11 +1,17 @@
 # chatbot/prompt.py
+import asyncio
+import functools
+import hashlib
 import os
+import threading
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import ChatPromptTemplate
 # Removed unused imports - using custom RAG function instead of chain
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_chroma import Chroma
-from config import settings, LLMConfig
+from services.embeddings_singleton import get_minilm
+from services.embedding_service import CHROMA_HNSW_METADATA
+from config import settings, get_llm
+from cachetools import TTLCache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,11 +27,8 @@ def initialize_rag_components():
     Similar to embedding service but for Q&A.
     """
     try:
-        # Initialize embeddings (same as embedding service)
-        embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2",
-            model_kwargs={'device': 'cpu'}
-        )
+        # Shared embeddings instance (same model as the embedding service)
+        embeddings = get_minilm()
         
         # Initialize ChromaDB (same configuration as embedding service)
         persist_directory = os.getenv("CHROMA_DB_DIRECTORY_PATH", "./data/db")
@@ -35,6 +38,7 @@ def initialize_rag_components():
             collection_name=collection_name,
             persist_directory=persist_directory,
             embedding_function=embeddings,
+            collection_metadata=CHROMA_HNSW_METADATA,
         )
         
         # Create retriever
@@ -51,7 +55,7 @@ def initialize_rag_components():
         #     google_api_key=settings.GOOGLE_API_KEY,
         # )
 
-        groq_llm = LLMConfig.LLM_PROVIDER
+        groq_llm = get_llm()
         
         logger.info("RAG components initialized successfully")
         logger.info("ChromaDB path: %s, Collection: %s", persist_directory, collection_name)
@@ -62,8 +66,12 @@ def initialize_rag_components():
         logger.error("Failed to initialize RAG components: %s", str(e))
         raise
 
-# Initialize RAG components
-retriever, llm = initialize_rag_components()
+# RAG components are created on first use rather than at import: loading the
+# embedding model and opening Chroma takes seconds and ~100 MB per worker,
+# which would otherwise be paid before the server can even bind its port.
+@functools.lru_cache(maxsize=1)
+def get_rag_components():
+    return initialize_rag_components()
 
 # Create prompt template for RAG-based Q&A
 chat_prompt = ChatPromptTemplate.from_template("""You are an AI assistant for TechStore, a modern e-commerce platform that sells gadgets and technical items. Your role is to help onboard new team members by answering any questions related to the product, including its features, functionality, user experience, and business value.
@@ -102,38 +110,66 @@ Answer based on the retrieved context about TechStore:""")
 
 
 def format_docs_with_sources(docs):
-    """Format documents and extract source information"""
-    formatted_context = "\n\n".join([doc.page_content for doc in docs])
+    """Format documents and extract source information in one pass"""
+    contents = []
     sources = []
-    for i, doc in enumerate(docs):
-        source_info = {
-            "chunk_id": i + 1,
+    for i, doc in enumerate(docs, 1):
+        content = doc.page_content
+        contents.append(content)
+        sources.append({
+            "chunk_id": i,
             "source": doc.metadata.get("source", "Unknown"),
-            "content_preview": doc.page_content[:150] + "..." if len(doc.page_content) > 150 else doc.page_content
-        }
-        sources.append(source_info)
-    return formatted_context, sources
+            "content_preview": content[:150] + "..." if len(content) > 150 else content
+        })
+    return "\n\n".join(contents), sources
+
+# Repeated questions are the norm in an onboarding chatbot; identical
+# (normalized) queries skip retrieval and the LLM entirely for a short TTL.
+# cachetools is not thread-safe and this cache is touched both from worker
+# threads (rag_with_sources runs via asyncio.to_thread) and from the event
+# loop (the streaming variant), so every access holds the lock.
+_ANSWER_CACHE: TTLCache = TTLCache(
+    maxsize=1024, ttl=float(os.getenv("RAG_ANSWER_CACHE_TTL", "300"))
+)
+_ANSWER_CACHE_LOCK = threading.Lock()
+
+
+def _answer_cache_key(query: str, extra_context: str) -> str:
+    normalized = f"{query.strip().lower()}\x00{extra_context.strip()}"
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
 
 def rag_with_sources(query: str, extra_context: str = ""):
     """RAG function that returns both answer and sources"""
+    cache_key = _answer_cache_key(query, extra_context)
+    with _ANSWER_CACHE_LOCK:
+        cached = _ANSWER_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
     try:
-        # Retrieve documents
-        docs = retriever.get_relevant_documents(query)
+        retriever, llm = get_rag_components()
+
+        # Retrieve documents (invoke avoids the deprecated
+        # get_relevant_documents wrapper and its per-call warning machinery)
+        docs = retriever.invoke(query)
         
         # Format context and extract sources
         context, sources = format_docs_with_sources(docs)
         if extra_context:
-            context = context + "\n\n" + extra_context
+            context = "\n\n".join((context, extra_context))
         
         # Generate response using the prompt template
         formatted_prompt = chat_prompt.format(context=context, user_input=query)
         response = llm.invoke(formatted_prompt)
         
-        return {
+        result = {
             "answer": response.content,
             "sources": sources,
             "context": context
         }
+        with _ANSWER_CACHE_LOCK:
+            _ANSWER_CACHE[cache_key] = result
+        return result
     except Exception as e:  # pylint: disable=broad-except
         logger.error("Error in RAG with sources: %s", str(e))
         return {
@@ -142,5 +178,51 @@ def rag_with_sources(query: str, extra_context: str = ""):
             "context": ""
         }
 
+async def rag_with_sources_stream(query: str, extra_context: str = ""):
+    """Streaming variant of rag_with_sources.
+
+    Yields ("sources", [...]) once, then ("token", text) chunks as the model
+    generates them, so the route can start sending bytes after retrieval
+    instead of waiting out the full generation. The assembled answer is
+    written to the same answer cache rag_with_sources reads.
+    """
+    cache_key = _answer_cache_key(query, extra_context)
+    with _ANSWER_CACHE_LOCK:
+        cached = _ANSWER_CACHE.get(cache_key)
+    if cached is not None:
+        yield "sources", cached["sources"]
+        yield "token", cached["answer"]
+        return
+    try:
+        retriever, llm = get_rag_components()
+
+        # Retrieval is synchronous Chroma work; keep it off the event loop
+        docs = await asyncio.to_thread(retriever.invoke, query)
+
+        context, sources = format_docs_with_sources(docs)
+        if extra_context:
+            context = "\n\n".join((context, extra_context))
+
+        yield "sources", sources
+
+        formatted_prompt = chat_prompt.format(context=context, user_input=query)
+        parts = []
+        async for chunk in llm.astream(formatted_prompt):
+            text = chunk.content
+            if text:
+                parts.append(text)
+                yield "token", text
+
+        with _ANSWER_CACHE_LOCK:
+            _ANSWER_CACHE[cache_key] = {
+                "answer": "".join(parts),
+                "sources": sources,
+                "context": context
+            }
+    except Exception as e:  # pylint: disable=broad-except
+        logger.error("Error in streaming RAG: %s", str(e))
+        yield "token", f"Sorry, I encountered an error: {str(e)}"
+
+
 # Create the RAG chain with sources
 chatbot_chain = rag_with_sources
\ No newline at end of file
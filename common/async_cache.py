@@ -0,0 +1,66 @@
+import asyncio
+import functools
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def async_ttl_cache(ttl: Optional[float] = None) -> Callable:
+    """Memoize an async function with an optional TTL (seconds).
+
+    The cache stores the in-flight asyncio.Task rather than the result, so
+    concurrent callers for the same key share a single round-trip
+    (single-flight). Failed or cancelled tasks are evicted so the next
+    caller retries. ttl=None caches forever.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        cache: Dict[Any, Tuple[Optional[float], asyncio.Task]] = {}
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = (args, tuple(sorted(kwargs.items())))
+            entry = cache.get(key)
+            if entry is not None:
+                expires_at, task = entry
+                fresh = expires_at is None or time.monotonic() < expires_at
+                failed = task.done() and (task.cancelled() or task.exception() is not None)
+                if fresh and not failed:
+                    return await asyncio.shield(task)
+
+            task = asyncio.get_running_loop().create_task(fn(*args, **kwargs))
+            expires_at = None if ttl is None else time.monotonic() + ttl
+            cache[key] = (expires_at, task)
+            try:
+                return await asyncio.shield(task)
+            except Exception:
+                entry = cache.get(key)
+                if entry is not None and entry[1] is task:
+                    del cache[key]
+                raise
+
+        wrapper.cache_clear = cache.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+def single_flight(fn: Callable) -> Callable:
+    """Collapse concurrent calls with identical arguments into one Task.
+
+    Unlike async_ttl_cache, nothing is retained after the call completes:
+    only overlapping in-flight requests share a round-trip, so results are
+    never served stale.
+    """
+    inflight: Dict[Any, asyncio.Task] = {}
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = (args, tuple(sorted(kwargs.items())))
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(fn(*args, **kwargs))
+            inflight[key] = task
+            task.add_done_callback(lambda _t: inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    return wrapper
@@ -0,0 +1,25 @@
+"""Fastest-available JSON codec for the hot agent paths.
+
+orjson (already pinned in requirements.txt) serializes and parses several
+times faster than the stdlib module. It stays optional: when unavailable we
+fall back to stdlib json, streaming the encode through iterencode so no
+second monolithic buffer is built.
+"""
+import json
+from typing import Any, Callable
+
+try:
+    import orjson
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    loads: Callable[[Any], Any] = orjson.loads
+    JSONDecodeError = orjson.JSONDecodeError
+except ImportError:  # pragma: no cover - orjson is in requirements
+
+    def dumps(obj: Any) -> str:
+        return "".join(json.JSONEncoder(ensure_ascii=False).iterencode(obj))
+
+    loads = json.loads
+    JSONDecodeError = json.JSONDecodeError
@@ -1,16 +1,29 @@
 from typing import Dict
-import json
 import re
 
+from common import jsonfast
+
+# Compiled once; parse_llm_json_response runs on every LLM reply.
+_FENCE_RE = re.compile(r"^```(?:json)?|```$", re.MULTILINE)
+_OBJ_RE = re.compile(r"\[.*\]|\{.*\}", re.DOTALL)
+
+
 def parse_llm_json_response(response: str) -> Dict:
+    # Most models return clean JSON; try the native parse before touching
+    # any regex, and only dig for an embedded object when that fails.
+    stripped = response.strip()
+    try:
+        return jsonfast.loads(stripped)
+    except (ValueError, TypeError):
+        pass
     try:
-        cleaned = re.sub(r"^```(?:json)?|```$", "", response.strip(), flags=re.MULTILINE).strip()
-        return json.loads(cleaned)
-    except json.JSONDecodeError as e:
+        cleaned = _FENCE_RE.sub("", stripped).strip()
+        return jsonfast.loads(cleaned)
+    except (ValueError, TypeError):
         try:
-            match = re.search(r"\[.*\]|\{.*\}", response, re.DOTALL)
+            match = _OBJ_RE.search(response)
             if match:
-                return json.loads(match.group(0))
+                return jsonfast.loads(match.group(0))
         except Exception:
             pass
-        return {}
\ No newline at end of file
+        return {}
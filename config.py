@@ -1,45 +1,81 @@
+import functools
 import os
+
 from dotenv import load_dotenv
-from services.llm_factory import LLMProvider, LLMFactory
+from pydantic import AliasChoices, Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# Load environment variables
+# Load environment variables for the modules that still read os.getenv directly
 load_dotenv()
 
-class Settings:
+
+class Settings(BaseSettings):
+    """Application settings, read from the environment once and frozen.
+
+    Values are validated at construction instead of re-coerced on every
+    access, and the instance is hashable/immutable so it is safe to share
+    across workers and cache keys.
+    """
+
+    model_config = SettingsConfigDict(env_file=".env", frozen=True, extra="ignore")
+
     # GitHub Configuration
-    GITHUB_TOKEN: str = os.getenv("GITHUB_TOKEN", "")
+    GITHUB_TOKEN: str = ""
     # Google AI Configuration
-    GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY", "")
-    
+    GOOGLE_API_KEY: str = ""
+
     # Application Configuration
-    APP_NAME: str = os.getenv("APP_NAME", "Dobb.ai Backend")
-    DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
-    
+    APP_NAME: str = "Dobb.ai Backend"
+    DEBUG: bool = False
+
     # GitHub MCP Server Configuration (used by mcp-use)
-    GITHUB_MCP_TOOLSETS: str = os.getenv("GITHUB_MCP_TOOLSETS", "repos,issues,pull_requests,actions,code_security")
-    GITHUB_MCP_READ_ONLY: bool = os.getenv("GITHUB_MCP_READ_ONLY", "False").lower() == "true"
+    GITHUB_MCP_TOOLSETS: str = "repos,issues,pull_requests,actions,code_security"
+    GITHUB_MCP_READ_ONLY: bool = False
     # Optional default repo scope for GitHub searches. Comma-separated list of owner/name.
-    GITHUB_DEFAULT_REPOS: str = os.getenv("GITHUB_DEFAULT_REPOS", "")
+    GITHUB_DEFAULT_REPOS: str = ""
     # Optional single repository URL (e.g., https://github.com/owner/repo)
-    GITHUB_REPO_URL: str = os.getenv("GITHUB_REPO_URL", "")
+    GITHUB_REPO_URL: str = ""
 
     # Jira MCP Server Configuration (used by mcp-use)
     # Jira connection details
-    JIRA_URL: str = os.getenv("JIRA_URL", "")
+    JIRA_URL: str = ""
     # Prefer JIRA_USERNAME but support legacy JIRA_USER_NAME
-    JIRA_USERNAME: str = os.getenv("JIRA_USERNAME", os.getenv("JIRA_USER_NAME", ""))
-    JIRA_USER_NAME: str = os.getenv("JIRA_USER_NAME", "")
-    JIRA_API_TOKEN: str = os.getenv("JIRA_API_TOKEN", "")
+    JIRA_USERNAME: str = Field(
+        "", validation_alias=AliasChoices("JIRA_USERNAME", "JIRA_USER_NAME")
+    )
+    JIRA_USER_NAME: str = ""
+    JIRA_API_TOKEN: str = ""
     # Optional SSL verification toggle for some deployments
-    JIRA_VERIFY_SSL: bool = os.getenv("JIRA_VERIFY_SSL", "True").lower() == "true"
-    JIRA_DEFAULT_PROJECT_KEY: str = os.getenv("JIRA_DEFAULT_PROJECT_KEY", "")
+    JIRA_VERIFY_SSL: bool = True
+    JIRA_DEFAULT_PROJECT_KEY: str = ""
     # Optional: Docker image or command to run Jira MCP server. If not set, client may fallback to npx server.
-    JIRA_MCP_SERVER_URL: str = os.getenv("JIRA_MCP_SERVER_URL", "")
+    JIRA_MCP_SERVER_URL: str = ""
+
+    # How long (seconds) to cache discovered MCP tool lists. Negative = forever.
+    MCP_TOOLS_CACHE_TTL: float = 300
+    # Max tool calls in flight per MCP server; stdio servers degrade when flooded.
+    MCP_MAX_CONCURRENCY: int = 4
+
+
 settings = Settings()
 
 
-class LLMConfig:
-    LLM_PROVIDER = LLMFactory.create(
+@functools.lru_cache(maxsize=1)
+def get_llm():
+    """Shared Groq chat model, constructed on first use.
+
+    Building the client at import time opened an HTTP session in every
+    process that touched config, including workers that never call an LLM;
+    the lazy import also keeps the langchain provider packages off the
+    config import path.
+    """
+    from services.llm_factory import LLMFactory, LLMProvider
+    from services.http_pool import ASYNC_HTTP
+
+    return LLMFactory.create(
         provider=LLMProvider.GROQ,
-        model_name="llama-3.3-70b-versatile" 
-    )
\ No newline at end of file
+        model_name="llama-3.3-70b-versatile",
+        # Async calls multiplex over the shared HTTP/2 pool instead of
+        # opening a dedicated connection per client
+        http_async_client=ASYNC_HTTP,
+    )
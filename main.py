@@ -1,8 +1,19 @@
 from fastapi import FastAPI  # type: ignore
 from fastapi.middleware.cors import CORSMiddleware  # type: ignore
+from fastapi.responses import ORJSONResponse  # type: ignore
 from contextlib import asynccontextmanager
+import asyncio
+import os
 import uvicorn  # type: ignore
 import logging
+
+# Use the libuv-based event loop for all async I/O (MCP clients, LLM calls).
+# Must run before the first event loop is created.
+try:
+    import uvloop  # type: ignore
+    uvloop.install()
+except ImportError:  # pragma: no cover - uvloop is unavailable on some platforms
+    pass
 from api.github_routes import router as github_router
 from api.chatbot_routes import router as chatbot_router
 from api.embedding_routes import router as embedding_router
@@ -10,20 +21,69 @@ from api.report_routes import router as report_router
 from api.jira_routes import router as jira_router
 from api.user_story_routes import router as user_story_router
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# INFO by default so the DEBUG-gated payload reprs in the agents cost
+# nothing per request; set LOG_LEVEL=DEBUG to get them back.
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+)
 logger = logging.getLogger(__name__)
 
+async def _mcp_keepalive(interval: float = 60.0) -> None:
+    """Ping each warm MCP session so the stdio subprocess stays alive.
+
+    A failed ping closes the client; the next use reconnects, so a crashed
+    or recycled server never serves a stale session to a real request.
+    """
+    from services.jira_mcp_client import jira_mcp_client
+    from services.mcp_client import mcp_client
+    while True:
+        await asyncio.sleep(interval)
+        for client in (jira_mcp_client, mcp_client):
+            if client.client is None:
+                continue
+            try:
+                session = await client.get_session()
+                await session.list_tools()
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.warning("MCP keepalive failed, resetting client: %s", exc)
+                try:
+                    await client.close()
+                except Exception:  # pylint: disable=broad-except
+                    pass
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI):  # unused param by design
     logger.info("Starting up Dobb.ai Backend API...")
+    # Warm the MCP sessions so the first user request reuses live connections
+    from agents import jira_agent as jira_agent_module
+    from agents import mcp_agent as mcp_agent_module
+    await jira_agent_module.warmup()
+    await mcp_agent_module.warmup()
+    keepalive = asyncio.get_running_loop().create_task(_mcp_keepalive())
     yield
     logger.info("Shutting down Dobb.ai Backend API...")
+    keepalive.cancel()
+    from services.jira_mcp_client import jira_mcp_client
+    from services.mcp_client import mcp_client
+    from services.mcp_pool import mcp_pool
+    for closeable in (jira_mcp_client, mcp_client, mcp_pool):
+        try:
+            await closeable.close()
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Error closing MCP resources: %s", exc)
+    from services import http_pool
+    await http_pool.aclose()
 
 app = FastAPI(
     title="Dobb.ai Backend API",
     description="A FastAPI server for Dobb.ai with GitHub MCP integration",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson serializes the large report/chat payloads several times faster
+    # than the stdlib encoder backing the default JSONResponse.
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -61,5 +121,45 @@ async def root():
 async def health_check():
     return {"status": "healthy", "message": "API is running"}
 
+# Admin hook to refresh MCP tool discovery after a server restart/upgrade
+@app.post("/admin/tools/invalidate")
+async def invalidate_tool_cache():
+    from agents.jira_agent import jira_agent
+    from agents.orchestrator import invalidate_tool_result_cache, registry
+    from services import mcp_tool_cache
+    from services.jira_mcp_client import jira_mcp_client
+    # Drop the persisted catalogs first so registry re-discovery cannot be
+    # served a stale entry, then reset the memos built on top of them: the
+    # Jira tool-name map and the agent's cache-forever list_tools wrapper.
+    mcp_tool_cache.invalidate()
+    jira_mcp_client._tool_name_map = None
+    jira_agent.list_tools.cache_clear()
+    await registry.invalidate()
+    invalidate_tool_result_cache()
+    return {"status": "ok", "message": "MCP tool cache invalidated"}
+
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    # reload=True forks a watcher process and disables multiple workers;
+    # keep it behind an env flag so the default invocation serves with the
+    # uvloop event loop, httptools parser, and a small worker pool.
+    if os.getenv("DEV_RELOAD", "").lower() in ("1", "true", "yes"):
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    elif uds_path := os.getenv("DOBB_UDS"):
+        # Same-host clients (e.g. a reverse proxy or an httpx client with a
+        # UDS transport) skip the TCP handshake and ephemeral ports entirely.
+        uvicorn.run(
+            "main:app",
+            uds=uds_path,
+            loop="uvloop",
+            http="httptools",
+            workers=int(os.getenv("WORKERS", "2")),
+        )
+    else:
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            workers=int(os.getenv("WORKERS", "2")),
+        )
@@ -1,21 +1,150 @@
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_chroma import Chroma
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.prompts import ChatPromptTemplate
 from langchain.docstore.document import Document
 from langchain_core.output_parsers import StrOutputParser
-from PyPDF2 import PdfReader
+try:
+    # pypdf is the maintained successor to PyPDF2 with faster text extraction
+    from pypdf import PdfReader
+except ImportError:
+    from PyPDF2 import PdfReader
 from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
-import uuid
+import hashlib
 import io
 import os
-from config import LLMConfig
+import re
+from cachetools import LRUCache
+from config import get_llm
+from services.embeddings_singleton import get_minilm
 
 
 load_dotenv()
 
+class _FastTextSplitter:
+    """One-pass splitter replacing RecursiveCharacterTextSplitter.
+
+    The recursive splitter re-scans and re-slices the text once per
+    separator level; this walks the text once with a precompiled separator
+    regex, cutting each chunk at the last natural break inside the window
+    and carrying a chunk_overlap tail into the next one. Same chunk_size/
+    chunk_overlap contract, O(N) with no recursion.
+    """
+
+    _SEPARATOR_RE = re.compile(r"\n\n|\n|\. |\? |! | ")
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 100):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def split_text(self, text: str) -> List[str]:
+        n = len(text)
+        if n <= self.chunk_size:
+            stripped = text.strip()
+            return [stripped] if stripped else []
+
+        chunks: List[str] = []
+        start = 0
+        while start < n:
+            end = start + self.chunk_size
+            if end >= n:
+                tail = text[start:].strip()
+                if tail:
+                    chunks.append(tail)
+                break
+            window = text[start:end]
+            cut = len(window)
+            # Cut at the last separator in the window, provided it leaves
+            # more than just the overlap carry behind.
+            last = None
+            for m in self._SEPARATOR_RE.finditer(window):
+                last = m
+            if last is not None and last.end() > self.chunk_overlap:
+                cut = last.end()
+            chunk = window[:cut].strip()
+            if chunk:
+                chunks.append(chunk)
+            start = max(start + cut - self.chunk_overlap, start + 1)
+        return chunks
+
+
+class _CachedEmbeddings:
+    """Content-hash cache in front of an Embeddings implementation.
+
+    Re-ingested chunks (PDF boilerplate, headers, repeated uploads) skip the
+    model forward pass entirely; only cache misses are encoded, then merged
+    back in order. Keys are blake2b digests of the chunk text.
+    """
+
+    def __init__(self, inner, maxsize: int = 50_000):
+        self.inner = inner
+        self._cache: LRUCache = LRUCache(maxsize=maxsize)
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(t) for t in texts]
+        vectors: List[Any] = [self._cache.get(k) for k in keys]
+        miss_idx = [i for i, v in enumerate(vectors) if v is None]
+        if miss_idx:
+            encoded = self.inner.embed_documents([texts[i] for i in miss_idx])
+            for i, vec in zip(miss_idx, encoded):
+                vectors[i] = vec
+                self._cache[keys[i]] = vec
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.inner.embed_query(text)
+
+
+# One wrapper (and cache) per model name for the process lifetime: services
+# are constructed per request via Depends, so an instance-level cache would
+# be discarded after every upload and only intra-document duplicates would
+# ever hit.
+_EMBEDDING_CACHES: Dict[str, _CachedEmbeddings] = {}
+
+
+def _cached_embeddings(model_name: str) -> _CachedEmbeddings:
+    wrapper = _EMBEDDING_CACHES.get(model_name)
+    if wrapper is None:
+        wrapper = _CachedEmbeddings(get_minilm(model_name))
+        _EMBEDDING_CACHES[model_name] = wrapper
+    return wrapper
+
+
+# Page-extraction workers: the PDF is parsed once per worker process via the
+# initializer, so each extraction task ships only a page index.
+_pdf_worker_reader = None
+
+
+def _init_pdf_worker(pdf_bytes: bytes) -> None:
+    global _pdf_worker_reader
+    _pdf_worker_reader = PdfReader(io.BytesIO(pdf_bytes))
+
+
+def _extract_pdf_page(index: int) -> str:
+    return _pdf_worker_reader.pages[index].extract_text() or ""
+
+
+# Below this page count the pool spawn costs more than it saves
+_PARALLEL_PDF_MIN_PAGES = 8
+
+
+# HNSW tuning for normalized MiniLM vectors: cosine space (dot-product fast
+# path), higher fan-out and build/search widths for better recall at k=3.
+# Applied when a collection is first created; existing collections keep the
+# parameters they were built with.
+CHROMA_HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64,
+}
+
+
 class EmbeddingService:
     def __init__(
         self,
@@ -24,22 +153,26 @@ class EmbeddingService:
         chat_model_name: str = "gpt-3.5-turbo",
         chunk_size: int = 1000,
         chunk_overlap: int = 100,
+        batch_size: int = 200,
         persist_directory: str = os.getenv("CHROMA_DB_DIRECTORY_PATH", "chroma_db"),
         collection_name: str = "default_collection"
     ):
         self.embedding_model_name = embedding_model_name
         self.chat_model_name = chat_model_name
         
-        # Instantiate HuggingFaceEmbeddings for embedding
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name=self.embedding_model_name,
-            model_kwargs={'device': 'cpu'}
-        )
+        # Shared MiniLM instance (see services.embeddings_singleton) behind
+        # the module-level content-hash cache, so every service reuses one
+        # copy of the model weights and one embedding cache.
+        self.embeddings = _cached_embeddings(self.embedding_model_name)
         
         # Instantiate the OpenAI chat model for generation
-        self.llm = LLMConfig.LLM_PROVIDER
+        self.llm = get_llm()
 
-        self.text_splitter = RecursiveCharacterTextSplitter(
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        # Documents awaiting a batched write to Chroma (see _store_in_chroma)
+        self._pending_docs: List[Document] = []
+        self.text_splitter = _FastTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap
         )
@@ -52,6 +185,7 @@ class EmbeddingService:
             collection_name=self.collection_name,
             persist_directory=self.persist_directory,
             embedding_function=self.embeddings,
+            collection_metadata=CHROMA_HNSW_METADATA,
         )
 
         self.retriever = self.db.as_retriever()
@@ -71,39 +205,115 @@ class EmbeddingService:
     def _create_chunks(self, text: str) -> List[str]:
         return self.text_splitter.split_text(text)
 
+    @staticmethod
+    def _chunk_metadatas(chunks: List[str], source: str, start_index: int = 0) -> List[Dict[str, Any]]:
+        """Deterministic content-addressed IDs over (source, index, content).
+
+        blake2b avoids the per-chunk urandom read of uuid4 and makes
+        re-ingesting the same document idempotent: identical chunks map to
+        identical IDs, which Chroma upserts instead of duplicating.
+        """
+        return [
+            {
+                "id": hashlib.blake2b(
+                    f"{source}\x00{start_index + i}\x00".encode("utf-8") + text.encode("utf-8"),
+                    digest_size=16,
+                ).hexdigest(),
+                "source": source,
+            }
+            for i, text in enumerate(chunks)
+        ]
+
     def _store_in_chroma(self, chunks: List[str], metadatas: List[Dict[str, Any]]):
-        """Append documents into Chroma collection"""
-        documents = [
+        """Buffer documents and write them to Chroma in fixed-size batches.
+
+        Each add_documents call pays a round-trip through Chroma's segment
+        pipeline, so documents accumulate until batch_size is reached; call
+        flush() to push the tail.
+        """
+        self._pending_docs.extend(
             Document(page_content=text, metadata=meta)
             for text, meta in zip(chunks, metadatas)
-        ]
-        self.db.add_documents(documents)
+        )
+        while len(self._pending_docs) >= self.batch_size:
+            batch = self._pending_docs[:self.batch_size]
+            del self._pending_docs[:self.batch_size]
+            self.db.add_documents(batch, ids=[d.metadata["id"] for d in batch])
 
-    def embed_text(self, text: str, source: str) -> Dict[str, Any]:
-        chunks = self._create_chunks(text)
-        metadatas = [{"id": str(uuid.uuid4()), "source": source} for _ in chunks]
-        self._store_in_chroma(chunks, metadatas)
-        
-        return {
-            "num_chunks": len(chunks),
-            "persist_directory": self.persist_directory,
-            "collection_name": self.collection_name,
-        }
+    def flush(self):
+        """Write any buffered documents to Chroma."""
+        if self._pending_docs:
+            batch = self._pending_docs
+            self._pending_docs = []
+            self.db.add_documents(batch, ids=[d.metadata["id"] for d in batch])
+
+    def _embed_pieces(self, pieces, source: str) -> Dict[str, Any]:
+        """Incrementally chunk and store text pieces without buffering them all.
+
+        Pieces are accumulated into a bounded window; once the window grows
+        past a few splitter chunks it is split and stored, keeping the last
+        split back as carry so chunk overlap survives window boundaries.
+        """
+        window_limit = max(self.chunk_size * 8, 64 * 1024)
+        buffer = ""
+        num_chunks = 0
+        for piece in pieces:
+            if not piece:
+                continue
+            buffer += piece
+            if len(buffer) >= window_limit:
+                chunks = self._create_chunks(buffer)
+                if len(chunks) > 1:
+                    buffer = chunks[-1]
+                    chunks = chunks[:-1]
+                    metadatas = self._chunk_metadatas(chunks, source, start_index=num_chunks)
+                    self._store_in_chroma(chunks, metadatas)
+                    num_chunks += len(chunks)
+        if buffer:
+            chunks = self._create_chunks(buffer)
+            metadatas = self._chunk_metadatas(chunks, source, start_index=num_chunks)
+            self._store_in_chroma(chunks, metadatas)
+            num_chunks += len(chunks)
+        self.flush()
 
-    def embed_pdf(self, pdf_bytes: bytes, source: str) -> Dict[str, Any]:
-        pdf_reader = PdfReader(io.BytesIO(pdf_bytes))
-        text = "".join([page.extract_text() or "" for page in pdf_reader.pages])
-        
-        chunks = self._create_chunks(text)
-        metadatas = [{"id": str(uuid.uuid4()), "source": source} for _ in chunks]
-        self._store_in_chroma(chunks, metadatas)
-        
         return {
-            "num_chunks": len(chunks),
+            "num_chunks": num_chunks,
             "persist_directory": self.persist_directory,
             "collection_name": self.collection_name,
         }
 
+    def embed_text_stream(self, fileobj, source: str, encoding: str = "utf-8") -> Dict[str, Any]:
+        """Embed a text file-like object by reading 64 KiB at a time."""
+        reader = io.TextIOWrapper(fileobj, encoding=encoding)
+        try:
+            return self._embed_pieces(iter(lambda: reader.read(64 * 1024), ""), source)
+        finally:
+            # Detach so closing the wrapper does not close the caller's file
+            reader.detach()
+
+    def embed_pdf_stream(self, fileobj, source: str) -> Dict[str, Any]:
+        """Embed a PDF file-like object page by page instead of all at once.
+
+        Text extraction is CPU-bound pure Python; big PDFs spread their
+        pages over a process pool (the spooled upload is seekable, so the
+        raw bytes can be re-read for the worker initializer), small ones
+        stream sequentially.
+        """
+        pdf_reader = PdfReader(fileobj)
+        num_pages = len(pdf_reader.pages)
+        if num_pages >= _PARALLEL_PDF_MIN_PAGES and fileobj.seekable():
+            fileobj.seek(0)
+            pdf_bytes = fileobj.read()
+            with ProcessPoolExecutor(
+                max_workers=min(8, os.cpu_count() or 1),
+                initializer=_init_pdf_worker,
+                initargs=(pdf_bytes,),
+            ) as pool:
+                return self._embed_pieces(pool.map(_extract_pdf_page, range(num_pages)), source)
+        return self._embed_pieces(
+            (page.extract_text() or "" for page in pdf_reader.pages), source
+        )
+
     async def get_response(self, prompt_text: str) -> str:
         response = await self.chain.ainvoke(prompt_text)
         return response
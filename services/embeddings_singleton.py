@@ -0,0 +1,28 @@
+"""Process-wide shared MiniLM embeddings.
+
+Both the embedding service and the chatbot RAG path use the same
+sentence-transformers model; constructing it twice costs ~90 MB of
+duplicated weights plus a second multi-second load. get_minilm memoizes
+one instance per (model, device) pair.
+"""
+import functools
+
+import torch
+from langchain_huggingface import HuggingFaceEmbeddings
+
+# MiniLM encodes roughly an order of magnitude faster on GPU; fall back to
+# CPU when no CUDA device is present.
+EMBEDDING_DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+@functools.lru_cache(maxsize=None)
+def get_minilm(model_name: str = DEFAULT_MODEL, device: str = EMBEDDING_DEVICE) -> HuggingFaceEmbeddings:
+    return HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs={"device": device},
+        # Batch document encodes so batched writes become a few large
+        # matmuls; normalized vectors make cosine a pure dot product.
+        encode_kwargs={"batch_size": 64, "normalize_embeddings": True},
+    )
@@ -0,0 +1,19 @@
+"""Shared outbound HTTP connection pool.
+
+The LLM clients and the Supabase download path each opened their own
+TCP/TLS connections, so a report fan-out paid several handshakes that an
+amortized pool avoids. One module-level httpx.AsyncClient with HTTP/2
+multiplexing and long keep-alive serves them all; it is closed from the
+FastAPI shutdown hook.
+"""
+import httpx
+
+ASYNC_HTTP = httpx.AsyncClient(
+    http2=True,
+    timeout=30.0,
+    limits=httpx.Limits(max_connections=50, keepalive_expiry=300.0),
+)
+
+
+async def aclose() -> None:
+    await ASYNC_HTTP.aclose()
@@ -1,78 +1,115 @@
 from typing import Any, Dict, List, Optional
+import functools
 import logging
+import os
 import shutil
 from mcp_use import MCPClient  # type: ignore
 from config import settings
+from common import jsonfast
+from services import mcp_tool_cache
+from services.mcp_pool import mcp_pool
 
 logger = logging.getLogger(__name__)
 
 
+@functools.cache
+def _has_docker() -> bool:
+    """Whether docker is on PATH; probed once instead of per connect.
+
+    DOBB_FORCE_NPX=1 skips the probe entirely (useful in CI, where docker
+    may exist but the Jira image should not be pulled).
+    """
+    if os.getenv("DOBB_FORCE_NPX", "").lower() in ("1", "true", "yes"):
+        return False
+    return shutil.which("docker") is not None
+
+
 class JiraMCPClient:
+    # Logical operation -> tool-name candidates, modern Atlassian name first.
+    _TOOL_CANDIDATES = {
+        "search": ("jira_search", "search_issues"),
+        "get": ("jira_get_issue", "get_issue"),
+        "create": ("jira_create_issue", "create_issue"),
+    }
+
     def __init__(self) -> None:
         self.client: Optional[MCPClient] = None
-
-    async def _ensure_client(self) -> MCPClient:
-        if self.client is None:
-            if not settings.JIRA_URL:
-                raise RuntimeError("JIRA_URL is not set")
-            if not (settings.JIRA_USERNAME or settings.JIRA_USER_NAME):
-                raise RuntimeError("JIRA_USERNAME/JIRA_USER_NAME is not set")
-            if not settings.JIRA_API_TOKEN:
-                raise RuntimeError("JIRA_API_TOKEN is not set")
-
-            # Prefer Docker image if provided and docker is available; otherwise use npx server
-            jira_env = {
-                "JIRA_URL": settings.JIRA_URL,
-                "JIRA_USERNAME": settings.JIRA_USERNAME or settings.JIRA_USER_NAME,
-                "JIRA_API_TOKEN": settings.JIRA_API_TOKEN,
-                "JIRA_VERIFY_SSL": str(settings.JIRA_VERIFY_SSL).lower(),
-            }
-
-            use_docker = bool(settings.JIRA_MCP_SERVER_URL) and shutil.which("docker") is not None
-
-            if use_docker:
-                config: Dict[str, Any] = {
-                    "mcpServers": {
-                        "jira": {
-                            "command": "docker",
-                            "args": [
-                                "run",
-                                "-i",
-                                "--rm",
-                                "-e",
-                                "JIRA_URL",
-                                "-e",
-                                "JIRA_USERNAME",
-                                "-e",
-                                "JIRA_API_TOKEN",
-                                "-e",
-                                "JIRA_VERIFY_SSL",
-                                settings.JIRA_MCP_SERVER_URL,
-                            ],
-                            "env": jira_env,
-                        }
+        self._tool_name_map: Optional[Dict[str, str]] = None
+        self._session = None
+
+    def _build_config(self) -> Dict[str, Any]:
+        if not settings.JIRA_URL:
+            raise RuntimeError("JIRA_URL is not set")
+        if not (settings.JIRA_USERNAME or settings.JIRA_USER_NAME):
+            raise RuntimeError("JIRA_USERNAME/JIRA_USER_NAME is not set")
+        if not settings.JIRA_API_TOKEN:
+            raise RuntimeError("JIRA_API_TOKEN is not set")
+
+        # Prefer Docker image if provided and docker is available; otherwise use npx server
+        jira_env = {
+            "JIRA_URL": settings.JIRA_URL,
+            "JIRA_USERNAME": settings.JIRA_USERNAME or settings.JIRA_USER_NAME,
+            "JIRA_API_TOKEN": settings.JIRA_API_TOKEN,
+            "JIRA_VERIFY_SSL": str(settings.JIRA_VERIFY_SSL).lower(),
+        }
+
+        use_docker = bool(settings.JIRA_MCP_SERVER_URL) and _has_docker()
+
+        if use_docker:
+            config: Dict[str, Any] = {
+                "mcpServers": {
+                    "jira": {
+                        "command": "docker",
+                        "args": [
+                            "run",
+                            "-i",
+                            "--rm",
+                            "-e",
+                            "JIRA_URL",
+                            "-e",
+                            "JIRA_USERNAME",
+                            "-e",
+                            "JIRA_API_TOKEN",
+                            "-e",
+                            "JIRA_VERIFY_SSL",
+                            settings.JIRA_MCP_SERVER_URL,
+                        ],
+                        "env": jira_env,
                     }
                 }
-            else:
-                # Fallback to official Atlassian MCP server via npx (stdio transport)
-                config = {
-                    "mcpServers": {
-                        "jira": {
-                            "command": "npx",
-                            "args": ["-y", "@modelcontextprotocol/server-atlassian"],
-                            "env": jira_env,
-                        }
+            }
+        else:
+            # Fallback to official Atlassian MCP server via npx (stdio transport)
+            config = {
+                "mcpServers": {
+                    "jira": {
+                        "command": "npx",
+                        "args": ["-y", "@modelcontextprotocol/server-atlassian"],
+                        "env": jira_env,
                     }
                 }
+            }
+        return config
 
-            self.client = MCPClient.from_dict(config)
+    async def _ensure_client(self) -> MCPClient:
+        if self.client is None:
+            self.client = MCPClient.from_dict(self._build_config())
             await self.client.create_all_sessions()
+            # Cache the handle; get_session re-validates on every lookup
+            self._session = self.client.get_session("jira")
         return self.client
 
+    async def get_session(self):
+        """Resolved jira session, cached for the client's lifetime."""
+        if self._session is None:
+            await self._ensure_client()
+        return self._session
+
     async def close(self) -> None:
         if self.client:
             await self.client.close_all_sessions()
             self.client = None
+            self._session = None
 
     @staticmethod
     def _unwrap_result(call_result: Any) -> Any:
@@ -85,8 +122,7 @@ class JiraMCPClient:
             text_value = getattr(first_item, "text", None)
             if isinstance(text_value, str):
                 try:
-                    import json as _json
-                    return _json.loads(text_value)
+                    return jsonfast.loads(text_value)
                 except Exception:
                     return text_value
             json_attr = getattr(first_item, "json", None)
@@ -100,20 +136,58 @@ class JiraMCPClient:
         return call_result
 
     async def list_tools(self) -> List[Dict[str, Any]]:
-        client = await self._ensure_client()
-        session = client.get_session("jira")
-        tools = await session.list_tools()
-        return self._unwrap_result(tools)  # type: ignore[return-value]
+        # The catalog only changes with the server config; a cache hit skips
+        # the subprocess spawn and list_tools round trip entirely.
+        cache_key = mcp_tool_cache.config_key(self._build_config())
+        cached = mcp_tool_cache.get(cache_key)
+        if cached is not None:
+            return cached  # type: ignore[return-value]
+        async with mcp_pool.acquire("jira") as session:
+            tools = await session.list_tools()
+        unwrapped = self._unwrap_result(tools)
+        mcp_tool_cache.put(cache_key, unwrapped)
+        return unwrapped  # type: ignore[return-value]
 
     async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
-        client = await self._ensure_client()
-        session = client.get_session("jira")
-        raw = await session.call_tool(name=name, arguments=arguments or {})
+        async with mcp_pool.acquire("jira") as session:
+            raw = await session.call_tool(name=name, arguments=arguments or {})
         return self._unwrap_result(raw)
 
-    # Convenience wrappers — actual tool names may vary; discover via list_tools
+    async def _resolve_tool(self, op: str) -> Optional[str]:
+        """Map a logical operation to the tool name the server advertises.
+
+        Resolving from the cached catalog replaces the old
+        try-modern-then-retry-legacy probing, which paid a full MCP round
+        trip plus an exception unwind whenever the first guess was wrong.
+        Returns None when the catalog is unavailable.
+        """
+        if self._tool_name_map is None:
+            names = set()
+            try:
+                for tool in await self.list_tools():
+                    name = tool.get("name") if isinstance(tool, dict) else getattr(tool, "name", None)
+                    if name:
+                        names.add(name)
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Jira tool discovery failed; falling back to probing", exc_info=True)
+            if names:
+                self._tool_name_map = {
+                    op_key: next((c for c in candidates if c in names), candidates[0])
+                    for op_key, candidates in self._TOOL_CANDIDATES.items()
+                }
+            else:
+                return None
+        return self._tool_name_map[op]
+
+    # Convenience wrappers — actual tool names vary; resolved via the catalog
     async def search_issues(self, jql: str, max_results: int = 50) -> Any:
-        """Try modern jira_search first; fallback to legacy search_issues."""
+        """Dispatch to jira_search or legacy search_issues directly."""
+        resolved = await self._resolve_tool("search")
+        if resolved == "search_issues":
+            return await self.call_tool("search_issues", {"jql": jql, "maxResults": max_results})
+        if resolved:
+            return await self.call_tool(resolved, {"jql": jql, "limit": max_results})
+        # No catalog available: keep the old probing fallback
         try:
             return await self.call_tool("jira_search", {"jql": jql, "limit": max_results})
         except Exception as exc:  # pylint: disable=broad-except
@@ -122,7 +196,12 @@ class JiraMCPClient:
             raise
 
     async def get_issue(self, key: str) -> Any:
-        """Try modern jira_get_issue; fallback to legacy get_issue."""
+        """Dispatch to jira_get_issue or legacy get_issue directly."""
+        resolved = await self._resolve_tool("get")
+        if resolved == "get_issue":
+            return await self.call_tool("get_issue", {"key": key})
+        if resolved:
+            return await self.call_tool(resolved, {"issue_key": key})
         try:
             return await self.call_tool("jira_get_issue", {"issue_key": key})
         except Exception as exc:  # pylint: disable=broad-except
@@ -137,32 +216,33 @@ class JiraMCPClient:
         description: str,
         issue_type: str = "Task",
     ) -> Any:
-        # Prefer modern Atlassian tool then fallback
+        modern_args = {
+            "project_key": project_key,
+            "summary": summary,
+            "description": description,
+            "issue_type": issue_type,
+        }
+        legacy_args = {
+            "projectKey": project_key,
+            "summary": summary,
+            "description": description,
+            "issueType": issue_type,
+        }
+        resolved = await self._resolve_tool("create")
+        if resolved == "create_issue":
+            return await self.call_tool("create_issue", legacy_args)
+        if resolved:
+            return await self.call_tool(resolved, modern_args)
         try:
-            return await self.call_tool(
-                "jira_create_issue",
-                {
-                    "project_key": project_key,
-                    "summary": summary,
-                    "description": description,
-                    "issue_type": issue_type,
-                },
-            )
+            return await self.call_tool("jira_create_issue", modern_args)
         except Exception as exc:  # pylint: disable=broad-except
             if not any(s in str(exc).lower() for s in ("unknown tool", "not found", "no such tool")):
                 raise
-            return await self.call_tool(
-                "create_issue",
-                {
-                    "projectKey": project_key,
-                    "summary": summary,
-                    "description": description,
-                    "issueType": issue_type,
-                },
-            )
+            return await self.call_tool("create_issue", legacy_args)
 
 
 # Global client instance
 jira_mcp_client = JiraMCPClient()
+mcp_pool.register("jira", jira_mcp_client._build_config)
 
 
@@ -1,17 +1,22 @@
+import importlib
 import os
 from enum import Enum
-from typing import Any
+from typing import Any, Dict
 from dotenv import load_dotenv
 
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
+# Read .env once at import; create() used to re-parse it per call.
+load_dotenv()
+
+# Provider classes resolved on first use; importing all three partner
+# packages eagerly pulled each one's HTTP stack and model tables into every
+# process, even though a deployment typically uses a single provider.
+_CLS_CACHE: Dict[str, Any] = {}
 
 
 class LLMProvider(Enum):
-    GPT = ("GPT", ChatOpenAI, "OPENAI_API_KEY")
-    GEMINI = ("GEMINI", ChatGoogleGenerativeAI, "GOOGLE_API_KEY")
-    GROQ = ("GROQ", ChatGroq, "GROQ_API_KEY")
+    GPT = ("GPT", "langchain_openai:ChatOpenAI", "OPENAI_API_KEY")
+    GEMINI = ("GEMINI", "langchain_google_genai:ChatGoogleGenerativeAI", "GOOGLE_API_KEY")
+    GROQ = ("GROQ", "langchain_groq:ChatGroq", "GROQ_API_KEY")
 
     @property
     def provider_name(self) -> str:
@@ -19,7 +24,13 @@ class LLMProvider(Enum):
 
     @property
     def model(self) -> str:
-        return self.value[1]
+        path = self.value[1]
+        cls = _CLS_CACHE.get(path)
+        if cls is None:
+            module_name, class_name = path.split(":")
+            cls = getattr(importlib.import_module(module_name), class_name)
+            _CLS_CACHE[path] = cls
+        return cls
     
     @property
     def api_key_tag(self) -> str:
@@ -27,8 +38,16 @@ class LLMProvider(Enum):
     
 
 class LLMFactory:
+    _instances: dict = {}
+
     @staticmethod
     def create(provider: LLMProvider = LLMProvider.GPT, model_name: str = "gpt-3.5-turbo", **kwargs) -> Any:
-        load_dotenv()
-        api_key = os.getenv(provider.api_key_tag)
-        return provider.model(model=model_name, api_key=api_key, **kwargs)
\ No newline at end of file
+        # Memoize per (provider, model, kwargs) so repeated constructions —
+        # e.g. the report sub-tasks — share one client and its HTTP pool.
+        key = (provider, model_name, tuple(sorted((k, id(v)) for k, v in kwargs.items())))
+        instance = LLMFactory._instances.get(key)
+        if instance is None:
+            api_key = os.getenv(provider.api_key_tag)
+            instance = provider.model(model=model_name, api_key=api_key, **kwargs)
+            LLMFactory._instances[key] = instance
+        return instance
\ No newline at end of file
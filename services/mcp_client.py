@@ -1,72 +1,100 @@
 from typing import Dict, List, Any, Optional
 import logging
+import re
 from mcp_use import MCPClient  # type: ignore
 from config import settings
+from common import jsonfast
+from common.async_cache import async_ttl_cache
+from services import mcp_tool_cache
+from services.mcp_pool import mcp_pool
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; _parse_enforced_repo runs on every scoped GitHub call.
+_GITHUB_REPO_RE = re.compile(r"github\.com/([\w.-]+)/([\w.-]+)")
+
 
 class GithubMCPClient:
     def __init__(self):
         self.client: Optional[MCPClient] = None
+        self._session = None
 
     @staticmethod
     def _parse_enforced_repo() -> Optional[tuple[str, str]]:
         url = settings.GITHUB_REPO_URL.strip()
         if not url:
             return None
-        import re as _re
-        m = _re.search(r"github\.com/([\w.-]+)/([\w.-]+)", url)
+        m = _GITHUB_REPO_RE.search(url)
         if not m:
             return None
         return m.group(1), m.group(2)
 
     @classmethod
     def _ensure_repo_in_query(cls, query: str) -> str:
-        enforced = cls._parse_enforced_repo()
-        if not enforced:
+        if not _ENFORCED_TOKEN:
             return query
-        owner, repo = enforced
         # If query already has a repo: qualifier for this repo, leave it
-        token = f"repo:{owner}/{repo}"
-        if token in query:
+        if _ENFORCED_TOKEN in query:
             return query
-        return f"{token} {query}".strip()
+        return f"{_ENFORCED_TOKEN} {query}".strip()
 
     @classmethod
     def _enforced_owner_repo(cls, owner: Optional[str], repo: Optional[str]) -> tuple[Optional[str], Optional[str]]:
-        enforced = cls._parse_enforced_repo()
-        if enforced:
-            return enforced[0], enforced[1]
+        if _ENFORCED_REPO:
+            return _ENFORCED_REPO
         return owner, repo
 
-    async def _ensure_client(self) -> MCPClient:
-        if self.client is None:
-            if not settings.GITHUB_TOKEN:
-                raise RuntimeError("GITHUB_TOKEN is not set")
-
-            config = {
-                "mcpServers": {
-                    "github": {
-                        "command": "npx",
-                        "args": ["-y", "@modelcontextprotocol/server-github"],
-                        "env": {
-                            "GITHUB_PERSONAL_ACCESS_TOKEN": settings.GITHUB_TOKEN,
-                            "GITHUB_TOOLSETS": settings.GITHUB_MCP_TOOLSETS,
-                            "GITHUB_READ_ONLY": str(settings.GITHUB_MCP_READ_ONLY).lower(),
-                        },
-                    }
+    @staticmethod
+    def _build_config() -> Dict[str, Any]:
+        if not settings.GITHUB_TOKEN:
+            raise RuntimeError("GITHUB_TOKEN is not set")
+
+        return {
+            "mcpServers": {
+                "github": {
+                    "command": "npx",
+                    "args": ["-y", "@modelcontextprotocol/server-github"],
+                    "env": {
+                        "GITHUB_PERSONAL_ACCESS_TOKEN": settings.GITHUB_TOKEN,
+                        "GITHUB_TOOLSETS": settings.GITHUB_MCP_TOOLSETS,
+                        "GITHUB_READ_ONLY": str(settings.GITHUB_MCP_READ_ONLY).lower(),
+                    },
                 }
             }
+        }
 
-            self.client = MCPClient.from_dict(config)
+    async def _ensure_client(self) -> MCPClient:
+        if self.client is None:
+            self.client = MCPClient.from_dict(self._build_config())
             await self.client.create_all_sessions()
+            # Cache the handle; get_session re-validates on every lookup
+            self._session = self.client.get_session("github")
         return self.client
 
+    async def get_session(self):
+        """Resolved github session, cached for the client's lifetime."""
+        if self._session is None:
+            await self._ensure_client()
+        return self._session
+
+    async def list_tools(self) -> List[Dict[str, Any]]:
+        # Mirrors JiraMCPClient.list_tools: the catalog is keyed by the full
+        # server config, so a warm cache avoids spawning the npx server.
+        cache_key = mcp_tool_cache.config_key(self._build_config())
+        cached = mcp_tool_cache.get(cache_key)
+        if cached is not None:
+            return cached  # type: ignore[return-value]
+        async with mcp_pool.acquire("github") as session:
+            tools = await session.list_tools()
+        unwrapped = self._unwrap_result(tools)
+        mcp_tool_cache.put(cache_key, unwrapped)
+        return unwrapped  # type: ignore[return-value]
+
     async def close(self) -> None:
         if self.client:
             await self.client.close_all_sessions()
             self.client = None
+            self._session = None
 
     @staticmethod
     def _unwrap_result(call_result: Any) -> Any:
@@ -87,8 +115,7 @@ class GithubMCPClient:
             text_value = getattr(first_item, "text", None)
             if isinstance(text_value, str):
                 try:
-                    import json as _json
-                    return _json.loads(text_value)
+                    return jsonfast.loads(text_value)
                 except (ValueError, TypeError):
                     return text_value
 
@@ -105,14 +132,14 @@ class GithubMCPClient:
         return call_result
 
     async def list_repositories(self, owner: str = None, per_page: int = 30) -> List[Dict[str, Any]]:
-        client = await self._ensure_client()
-        session = client.get_session("github")
-        enforced = self._parse_enforced_repo()
-        if enforced:
-            query = f"repo:{enforced[0]}/{enforced[1]}"
-        else:
-            query = f"user:{owner}" if owner else "stars:>1000"
-        raw = await session.call_tool(name="search_repositories", arguments={"query": query, "perPage": per_page})
+        if _ENFORCED_REPO:
+            # The answer is a single known repo; the cached get_repository
+            # lookup replaces a search round trip per call.
+            repo = await self.get_repository(_ENFORCED_REPO[0], _ENFORCED_REPO[1])
+            return [repo] if repo else []
+        query = f"user:{owner}" if owner else "stars:>1000"
+        async with mcp_pool.acquire("github") as session:
+            raw = await session.call_tool(name="search_repositories", arguments={"query": query, "perPage": per_page})
         data = self._unwrap_result(raw)
         # Normalize to list of repos
         if isinstance(data, dict):
@@ -120,11 +147,13 @@ class GithubMCPClient:
             return items if isinstance(items, list) else []
         return data if isinstance(data, list) else []
 
+    # Repo metadata is stable over a session; concurrent callers share one
+    # round trip and repeats are served from cache for the TTL.
+    @async_ttl_cache(ttl=300)
     async def get_repository(self, owner: str, repo: str) -> Dict[str, Any]:
-        client = await self._ensure_client()
-        session = client.get_session("github")
         owner, repo = self._enforced_owner_repo(owner, repo)
-        raw = await session.call_tool(name="search_repositories", arguments={"query": f"repo:{owner}/{repo}", "perPage": 1})
+        async with mcp_pool.acquire("github") as session:
+            raw = await session.call_tool(name="search_repositories", arguments={"query": f"repo:{owner}/{repo}", "perPage": 1})
         data = self._unwrap_result(raw)
         if isinstance(data, list):
             return data[0] if data else {}
@@ -134,23 +163,21 @@ class GithubMCPClient:
         return {}
 
     async def list_commits(self, owner: str, repo: str, sha: str = None, path: str = None, per_page: int = 30) -> List[Dict[str, Any]]:
-        client = await self._ensure_client()
-        session = client.get_session("github")
         owner, repo = self._enforced_owner_repo(owner, repo)
         args: Dict[str, Any] = {"owner": owner, "repo": repo, "perPage": per_page}
         if sha:
             args["sha"] = sha
         if path:
             args["path"] = path
-        raw = await session.call_tool(name="list_commits", arguments=args)
+        async with mcp_pool.acquire("github") as session:
+            raw = await session.call_tool(name="list_commits", arguments=args)
         data = self._unwrap_result(raw)
         return data if isinstance(data, list) else []
 
     async def get_commit(self, owner: str, repo: str, ref: str) -> Dict[str, Any]:
-        client = await self._ensure_client()
-        session = client.get_session("github")
         owner, repo = self._enforced_owner_repo(owner, repo)
-        raw = await session.call_tool(name="get_commit", arguments={"owner": owner, "repo": repo, "ref": ref})
+        async with mcp_pool.acquire("github") as session:
+            raw = await session.call_tool(name="get_commit", arguments={"owner": owner, "repo": repo, "ref": ref})
         data = self._unwrap_result(raw)
         return data if isinstance(data, dict) else {}
 
@@ -175,9 +202,6 @@ class GithubMCPClient:
         - page: Optional page number (min 1)
         - per_page: Optional page size (min 1, max 100)
         """
-        client = await self._ensure_client()
-        session = client.get_session("github")
-
         # Enforce repo scoping always
         query = self._ensure_repo_in_query(query)
         owner, repo = self._enforced_owner_repo(owner, repo)
@@ -196,7 +220,8 @@ class GithubMCPClient:
         if per_page is not None:
             args["perPage"] = per_page  # MCP expects camelCase
 
-        raw = await session.call_tool(name="search_issues", arguments=args)
+        async with mcp_pool.acquire("github") as session:
+            raw = await session.call_tool(name="search_issues", arguments=args)
         data = self._unwrap_result(raw)
 
         # Normalize to list of issues
@@ -206,5 +231,13 @@ class GithubMCPClient:
         return data if isinstance(data, list) else []
 
 
+# Settings are frozen, so the enforced-repo scope cannot change at runtime;
+# resolve the tuple and query token once instead of a regex search per call.
+_ENFORCED_REPO = GithubMCPClient._parse_enforced_repo()
+_ENFORCED_TOKEN = (
+    f"repo:{_ENFORCED_REPO[0]}/{_ENFORCED_REPO[1]}" if _ENFORCED_REPO else None
+)
+
 # Global client instance
 mcp_client = GithubMCPClient()
+mcp_pool.register("github", GithubMCPClient._build_config)
@@ -0,0 +1,134 @@
+"""Pool of warm MCP stdio sessions shared by the Jira and GitHub clients.
+
+A stdio transport is not safe for concurrent writes: parallel call_tool on
+one session can interleave frames and corrupt the JSON-RPC stream. The pool
+holds up to N sessions per server, each guarded by its own asyncio.Lock, and
+hands out the first free one (round-robin when all are busy), so calls to
+the same server pipeline across subprocesses instead of queueing on a single
+stream. Bookkeeping is per server and sessions are spawned outside the
+critical section, so one server's slow subprocess spawn never blocks
+checkouts for the other. Sessions idle past the timeout are closed so server
+subprocesses do not linger.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List
+
+from mcp_use import MCPClient  # type: ignore
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledSession:
+    __slots__ = ("client", "session", "lock", "last_used")
+
+    def __init__(self, client: MCPClient, session: Any) -> None:
+        self.client = client
+        self.session = session
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+
+class MCPServerPool:
+    def __init__(
+        self,
+        size: int = 0,
+        idle_timeout: float = 300.0,
+        create_timeout: float = 60.0,
+    ) -> None:
+        self._size = size or settings.MCP_MAX_CONCURRENCY
+        self._idle_timeout = idle_timeout
+        self._create_timeout = create_timeout
+        self._factories: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._sessions: Dict[str, List[_PooledSession]] = {}
+        self._rr: Dict[str, int] = {}
+        # Per-server bookkeeping: a condition guards each server's entry
+        # list, and _pending counts in-flight creations reserving slots.
+        self._conds: Dict[str, asyncio.Condition] = {}
+        self._pending: Dict[str, int] = {}
+
+    def register(self, server: str, config_factory: Callable[[], Dict[str, Any]]) -> None:
+        """Associate a server name with the config used to spawn it."""
+        self._factories[server] = config_factory
+
+    async def _create(self, server: str) -> _PooledSession:
+        client = MCPClient.from_dict(self._factories[server]())
+        await client.create_all_sessions()
+        return _PooledSession(client, client.get_session(server))
+
+    def _evict_idle(self, entries: List[_PooledSession]) -> None:
+        now = time.monotonic()
+        expired = [
+            e for e in entries
+            if not e.lock.locked() and now - e.last_used > self._idle_timeout
+        ]
+        for entry in expired:
+            entries.remove(entry)
+            # Close in the background; checkout should not wait on teardown
+            asyncio.get_running_loop().create_task(entry.client.close_all_sessions())
+
+    async def _checkout(self, server: str) -> _PooledSession:
+        if server not in self._factories:
+            raise RuntimeError(f"No MCP server registered under {server!r}")
+        cond = self._conds.setdefault(server, asyncio.Condition())
+        while True:
+            async with cond:
+                entries = self._sessions.setdefault(server, [])
+                self._evict_idle(entries)
+                for entry in entries:
+                    if not entry.lock.locked():
+                        return entry
+                pending = self._pending.get(server, 0)
+                if len(entries) + pending < self._size:
+                    # Reserve a slot, then spawn outside the critical section
+                    self._pending[server] = pending + 1
+                    break
+                if entries:
+                    # All sessions busy at capacity; round-robin so waiters
+                    # spread out
+                    idx = self._rr.get(server, 0) % len(entries)
+                    self._rr[server] = idx + 1
+                    return entries[idx]
+                # Every slot is an in-flight creation; wait for one to land
+                await cond.wait()
+        try:
+            entry = await asyncio.wait_for(
+                self._create(server), self._create_timeout
+            )
+        except BaseException:
+            async with cond:
+                self._pending[server] -= 1
+                cond.notify_all()
+            raise
+        async with cond:
+            self._pending[server] -= 1
+            self._sessions.setdefault(server, []).append(entry)
+            cond.notify_all()
+        return entry
+
+    @asynccontextmanager
+    async def acquire(self, server: str):
+        """Yield an exclusively-held session for one call sequence."""
+        entry = await self._checkout(server)
+        async with entry.lock:
+            try:
+                yield entry.session
+            finally:
+                entry.last_used = time.monotonic()
+
+    async def close(self) -> None:
+        entries = [e for pool in self._sessions.values() for e in pool]
+        self._sessions.clear()
+        for entry in entries:
+            try:
+                await entry.client.close_all_sessions()
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Error closing pooled MCP session", exc_info=True)
+
+
+# Global pool instance; clients register their config factories at import
+mcp_pool = MCPServerPool()
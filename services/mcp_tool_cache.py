@@ -0,0 +1,83 @@
+"""Cross-process cache for MCP tool catalogs.
+
+Tool discovery pays a stdio subprocess spawn plus a list_tools JSON-RPC
+round trip, which is seconds on a cold start. A server's catalog only
+changes when its command/image or configuration does, so entries are keyed
+by a hash of the full server config (command, args, env — including the
+settings that feed them) and persisted to disk for reuse across restarts.
+Changing e.g. JIRA_MCP_SERVER_URL or GITHUB_MCP_TOOLSETS changes the key,
+which invalidates the entry naturally.
+"""
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_CACHE_PATH = os.path.join(
+    os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "dobb",
+    "mcp_tools.json",
+)
+
+_TOOL_CATALOG_CACHE: Dict[str, List[Any]] = {}
+_disk_loaded = False
+
+
+def config_key(config: Dict[str, Any]) -> str:
+    """Stable digest of a server config dict (env values included)."""
+    blob = json.dumps(config, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def _load_disk() -> None:
+    global _disk_loaded
+    if _disk_loaded:
+        return
+    _disk_loaded = True
+    try:
+        with open(_CACHE_PATH, encoding="utf-8") as fh:
+            data = json.load(fh)
+        if isinstance(data, dict):
+            _TOOL_CATALOG_CACHE.update(data)
+    except (OSError, ValueError):
+        pass
+
+
+def get(key: str) -> Optional[List[Any]]:
+    _load_disk()
+    return _TOOL_CATALOG_CACHE.get(key)
+
+
+def put(key: str, tools: List[Any]) -> None:
+    _TOOL_CATALOG_CACHE[key] = tools
+    # Persist best-effort: catalogs of raw Tool objects are still served from
+    # memory even when they cannot be written as JSON.
+    try:
+        os.makedirs(os.path.dirname(_CACHE_PATH), exist_ok=True)
+        tmp_path = _CACHE_PATH + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump({k: v for k, v in _TOOL_CATALOG_CACHE.items()
+                       if _is_jsonable(v)}, fh)
+        os.replace(tmp_path, _CACHE_PATH)
+    except OSError as exc:
+        logger.debug("Could not persist MCP tool catalog: %s", exc)
+
+
+def _is_jsonable(value: Any) -> bool:
+    try:
+        json.dumps(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def invalidate() -> None:
+    """Drop the in-memory catalog; the next miss re-discovers and rewrites."""
+    _TOOL_CATALOG_CACHE.clear()
+    try:
+        os.remove(_CACHE_PATH)
+    except OSError:
+        pass
@@ -3,28 +3,33 @@ from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough
 from dotenv import load_dotenv
 
-from config import LLMConfig
+from config import get_llm
 
 load_dotenv()
 
 class PRDResponseService:
+    # The template takes system_prompt as an input variable, so one compiled
+    # chain serves every instance; building it per __init__ re-ran template
+    # parsing and LCEL graph wiring for each report sub-task. Built lazily so
+    # importing the module does not construct the LLM client.
+    _PROMPT = ChatPromptTemplate.from_template(
+        "SYSTEM: {system_prompt}\nPRD: {prd_text}"
+    )
+    _CHAIN = None
+
     def __init__(
         self,
         system_prompt: str = "You are an expert assistant. Answer concisely and clearly.",
     ):
         self.system_prompt = system_prompt
-        self.llm = LLMConfig.LLM_PROVIDER
-
-        self.prompt = ChatPromptTemplate.from_template(
-            "SYSTEM: {system_prompt}\nPRD: {prd_text}"
-        )
-
-        self.chain = (
-            {"system_prompt": RunnablePassthrough(), "prd_text": RunnablePassthrough()}
-            | self.prompt
-            | self.llm
-            | StrOutputParser()
-        )
+        if PRDResponseService._CHAIN is None:
+            PRDResponseService._CHAIN = (
+                {"system_prompt": RunnablePassthrough(), "prd_text": RunnablePassthrough()}
+                | PRDResponseService._PROMPT
+                | get_llm()
+                | StrOutputParser()
+            )
+        self.chain = PRDResponseService._CHAIN
 
     async def generate_response(self, prd_text: str) -> str:
         response = await self.chain.ainvoke({"system_prompt": self.system_prompt, "prd_text": prd_text})
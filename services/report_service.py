@@ -1,7 +1,7 @@
-import json
-import re
 import asyncio
-from typing import Dict
+import functools
+import logging
+from typing import Dict, Optional
 from pydantic import BaseModel
 
 from services.embedding_service import EmbeddingService
@@ -11,23 +11,84 @@ from data.templates.prompt import (
     PRD_REFINER_SYSTEM_PROMPT, 
     IMPACTED_MODULES_SYSTEM_PROMPT, 
     TECH_IMPACT_SYSTEM_PROMPT,
-    IDENTIFIED_GAPS_SYSTEM_PROMPT
+    IDENTIFIED_GAPS_SYSTEM_PROMPT,
+    COMBINED_REPORT_SYSTEM_PROMPT
 )
 
 from common.utils import parse_llm_json_response
 from services.supabase_service import SupabaseService
 
+logger = logging.getLogger(__name__)
+
 class ReportRequest(BaseModel):
     prd_url: str
 
+# Keys the combined single-call report must produce; missing any of them
+# falls back to the sectioned parallel path.
+_REPORT_KEYS = (
+    "title",
+    "summary",
+    "refined_prd",
+    "impactedModules",
+    "technicalImpacts",
+    "identifiedGaps",
+)
+
+# Cap concurrent Groq calls per report so a burst of analyses does not trip
+# the provider's rate limit; 4 in flight keeps wall time near max(call).
+_LLM_CONCURRENCY = asyncio.Semaphore(4)
+
+
+async def _with_llm_slot(coro):
+    async with _LLM_CONCURRENCY:
+        return await coro
+
+
+async def _isolated(coro):
+    """Run one report sub-task; failures become error values.
+
+    Resolving exceptions to dicts keeps the TaskGroup from cancelling
+    sibling analyses when a single section fails — the report degrades
+    per-section instead.
+    """
+    try:
+        return await _with_llm_slot(coro)
+    except Exception as exc:  # pylint: disable=broad-except
+        return {"error": str(exc)}
+
+
+# One service per distinct prompt, shared across report runs. Each
+# PRDResponseService compiles a prompt template and each EmbeddingService
+# additionally opens Chroma and the embeddings model, so rebuilding them for
+# every sub-task put construction cost on the report's critical path.
+@functools.lru_cache(maxsize=None)
+def _prd_service(system_prompt: str) -> PRDResponseService:
+    return PRDResponseService(system_prompt)
+
+
+@functools.lru_cache(maxsize=None)
+def _analysis_service(system_prompt: str, user_message: str) -> EmbeddingService:
+    return EmbeddingService(prompt_messages=[
+        ("system", system_prompt),
+        ("user", user_message),
+    ])
+
+
 class ReportService:
     async def generate_report(self, prd_url: str) -> Dict:
         prd_text = await SupabaseService.download_file_content(prd_url)
-        
+
         if not prd_text:
             return {"error": "PRD file empty"}
 
-        tasks = {
+        # One combined call sends the PRD tokens once instead of five times;
+        # the sectioned path below remains the fallback when the combined
+        # output is truncated or malformed.
+        combined = await self._generate_combined_report(prd_text)
+        if combined is not None:
+            return combined
+
+        coros = {
             "summary": self._generate_prd_summary(prd_text),
             "refined_prd": self._generate_refined_prd(prd_text),
             "impacted_modules": self._generate_impacted_modules_report(prd_text),
@@ -35,14 +96,10 @@ class ReportService:
             "identified_gaps": self._generate_identified_gaps_report(prd_text)
         }
 
-        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        async with asyncio.TaskGroup() as tg:
+            tasks = {key: tg.create_task(_isolated(coro)) for key, coro in coros.items()}
 
-        results_dict = {}
-        for key, result in zip(tasks.keys(), results):
-            if isinstance(result, Exception):
-                results_dict[key] = {"error": str(result)}
-            else:
-                results_dict[key] = result
+        results_dict = {key: task.result() for key, task in tasks.items()}
 
         final_result = {
             **results_dict.get("summary"),
@@ -55,57 +112,56 @@ class ReportService:
         return final_result
 
 
+    async def _generate_combined_report(self, prd_text: str) -> Optional[Dict]:
+        try:
+            service = _analysis_service(
+                COMBINED_REPORT_SYSTEM_PROMPT, "Produce the full PRD analysis report."
+            )
+            llm_response = await _with_llm_slot(service.get_response(prd_text))
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Combined report call failed, using sectioned path: %s", exc)
+            return None
+        data = parse_llm_json_response(llm_response)
+        if isinstance(data, dict) and all(key in data for key in _REPORT_KEYS):
+            return data
+        logger.info("Combined report output incomplete, using sectioned path")
+        return None
+
     async def _generate_prd_summary(self, prd_text: str) -> Dict:
-        response_service = PRDResponseService(PRD_SUMMARIZER_SYSTEM_PROMPT)
+        response_service = _prd_service(PRD_SUMMARIZER_SYSTEM_PROMPT)
         llm_response = await response_service.generate_response(prd_text)
         json_response = parse_llm_json_response(llm_response)
         return json_response
 
     async  def _generate_refined_prd(self, prd_text: str) -> str:
-        response_service = PRDResponseService(PRD_REFINER_SYSTEM_PROMPT)
+        response_service = _prd_service(PRD_REFINER_SYSTEM_PROMPT)
         response = await response_service.generate_response(prd_text)
         return response
 
     async def _generate_impacted_modules_report(self, prd_text: str) -> Dict:
-        embedding_service = EmbeddingService(prompt_messages=[
-            ("system", IMPACTED_MODULES_SYSTEM_PROMPT),
-            ("user", "Analyze the impact of the PRD."),
-        ])
+        embedding_service = _analysis_service(
+            IMPACTED_MODULES_SYSTEM_PROMPT, "Analyze the impact of the PRD."
+        )
         llm_response = await embedding_service.get_response(prd_text)
         json_response = parse_llm_json_response(llm_response)
         return json_response 
 
     async def _generate_technical_impact_report(self, prd_text: str) -> Dict:
-        embedding_service = EmbeddingService(prompt_messages=[
-            ("system", TECH_IMPACT_SYSTEM_PROMPT),
-            ("user", "Analyze the technical impacts of the PRD."),
-        ])
+        embedding_service = _analysis_service(
+            TECH_IMPACT_SYSTEM_PROMPT, "Analyze the technical impacts of the PRD."
+        )
         llm_response = await embedding_service.get_response(prd_text)
         json_response = parse_llm_json_response(llm_response)
         return json_response
     
     async def _generate_identified_gaps_report(self, prd_text: str) -> Dict:
-        embedding_service = EmbeddingService(prompt_messages=[
-            ("system", IDENTIFIED_GAPS_SYSTEM_PROMPT),
-            ("user", "Identify the gaps of the PRD."),
-        ])
+        embedding_service = _analysis_service(
+            IDENTIFIED_GAPS_SYSTEM_PROMPT, "Identify the gaps of the PRD."
+        )
         llm_response = await embedding_service.get_response(prd_text)
         json_response = parse_llm_json_response(llm_response)
         return json_response
 
-    def _parse_llm_json(self, response: str) -> Dict:
-        try:
-            cleaned = re.sub(r"^```(?:json)?|```$", "", response.strip(), flags=re.MULTILINE).strip()
-            return json.loads(cleaned)
-        except json.JSONDecodeError as e:
-            try:
-                match = re.search(r"\[.*\]|\{.*\}", response, re.DOTALL)
-                if match:
-                    return json.loads(match.group(0))
-            except Exception:
-                pass
-            return {}
-
 
 def get_report_service():
     return ReportService()
\ No newline at end of file
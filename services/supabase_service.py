@@ -1,14 +1,44 @@
-import requests
-from docx import Document
-from dotenv import load_dotenv
+import asyncio
 import io
 import os
 import logging
+from typing import Optional, Tuple
+
+import zipfile
+
+from dotenv import load_dotenv
+from lxml import etree  # python-docx dependency; used directly for streaming
+from cachetools import TTLCache
+
+from services.http_pool import ASYNC_HTTP
 
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+# Extracted text per URL, revalidated with If-None-Match: the report and
+# user-story flows fetch the same PRD URL, and a 304 skips the transfer and
+# the docx parse entirely.
+_TEXT_CACHE: TTLCache = TTLCache(
+    maxsize=64, ttl=float(os.getenv("PRD_TEXT_CACHE_TTL", "300"))
+)
+
+
+_WORD_P_TAG = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}p"
+
+
+def _extract_docx_text(file_content: bytes) -> str:
+    # iterparse streams paragraph elements and frees each after reading,
+    # instead of materializing the whole python-docx object graph.
+    paragraphs = []
+    with zipfile.ZipFile(io.BytesIO(file_content)) as archive:
+        with archive.open("word/document.xml") as fh:
+            for _event, element in etree.iterparse(fh, tag=_WORD_P_TAG):
+                paragraphs.append("".join(element.itertext()))
+                element.clear()
+    return "\n".join(paragraphs)
+
+
 class SupabaseService:
     SUPABASE_URL = os.getenv("SUPABASE_URL")
 
@@ -18,23 +48,28 @@ class SupabaseService:
             logger.info(f"Downloading file content from {file_url}")
             if not file_url.startswith(SupabaseService.SUPABASE_URL):
                 raise Exception("Invalid Supabase URL provided.")
-            
-            response = requests.get(file_url)
+
+            cached: Optional[Tuple[Optional[str], str]] = _TEXT_CACHE.get(file_url)
+            headers = {}
+            if cached and cached[0]:
+                headers["If-None-Match"] = cached[0]
+
+            response = await ASYNC_HTTP.get(file_url, headers=headers)
+            if response.status_code == 304 and cached:
+                return cached[1]
             response.raise_for_status()
 
             file_content = response.content
 
             if file_url.endswith(".docx"):
-                doc_file = io.BytesIO(file_content)
-                doc = Document(doc_file)
-                full_text = []
-                for para in doc.paragraphs:
-                    full_text.append(para.text)
-                return "\n".join(full_text)
-                
+                # python-docx parsing is CPU-bound; keep it off the event loop
+                text = await asyncio.to_thread(_extract_docx_text, file_content)
             else:
-                return file_content.decode('utf-8')
+                text = file_content.decode('utf-8')
+
+            _TEXT_CACHE[file_url] = (response.headers.get("ETag"), text)
+            return text
 
         except Exception as e:
-            print(f"An error occurred: {e}")
-            return None
\ No newline at end of file
+            logger.error(f"An error occurred: {e}")
+            return None
@@ -11,6 +11,13 @@ class UserStoryRequest(BaseModel):
     prd_url: str
 
 class UserStoryService:
+    # Shared prefix prepended to every test case; a tuple so the splice
+    # below copies two strings instead of rebuilding each steps list.
+    _INITIAL_STEPS = (
+        "Goto unsatirisable-archangelic-tia.ngrok-free.dev",
+        "Login using username: `codeblooded1111@gmail.com`  and password: `Codeblooded@1`",
+    )
+
     async def generate_stories(self, prd_url: str) -> List[Dict[str, Any]]:
         prd_text = await SupabaseService.download_file_content(prd_url)
         embedding_service = EmbeddingService(prompt_messages=[
@@ -23,16 +30,15 @@ class UserStoryService:
         return updated_response
 
     def _add_initial_steps(self, response: Dict) -> Dict:
-        initial_steps = [
-            "Goto unsatirisable-archangelic-tia.ngrok-free.dev",
-            "Login using username: `codeblooded1111@gmail.com`  and password: `Codeblooded@1`"
-        ] 
-
         for user_story in response:
-            test_cases = user_story.get("test_cases", [])
-            for test_case in test_cases:
-                updated_steps = [*initial_steps, *test_case.get("steps", [])]
-                test_case["steps"] = updated_steps 
+            for test_case in user_story.get("test_cases") or ():
+                steps = test_case.get("steps")
+                if steps is None:
+                    test_case["steps"] = list(self._INITIAL_STEPS)
+                else:
+                    # Splice the prefix in place instead of allocating a new
+                    # list per test case
+                    steps[:0] = self._INITIAL_STEPS
         
         return response
                 
@@ -1,8 +1,10 @@
 import streamlit as st
 import requests
+import uuid
+from requests.adapters import HTTPAdapter
+import html
 import json
 import time
-from datetime import datetime
 
 # Configure the Streamlit page
 st.set_page_config(
@@ -14,79 +16,196 @@ st.set_page_config(
 
 # API Configuration
 API_BASE_URL = "http://127.0.0.1:8000"
-CHATBOT_ENDPOINT = f"{API_BASE_URL}/chatbot/"
+CHATBOT_STREAM_ENDPOINT = f"{API_BASE_URL}/chatbot/stream"
 
+# Static sidebar copy, kept at module scope so the rerun path only passes
+# a reference to st.markdown instead of rebuilding the literal inline
+SIDEBAR_HELP_MD = """
+**🛍️ What I Can Help With**
+- Product catalog features
+- Shopping cart functionality
+- User account management
+- Order placement process
+- Platform capabilities
+
+**💡 How It Works**
+- Your question → Search knowledge base
+- Retrieve relevant information
+- Provide clear, user-friendly answers
+
+**🎯 Best Questions**
+- "How does the shopping cart work?"
+- "What user account features are available?"
+- "How do customers place orders?"
+- "What makes the platform secure?"
+
+**⚡ Features**
+- E-commerce focused responses
+- User experience explanations
+- Business value insights
+"""
+
+# (key, prompt) pairs precomputed once; enumeration gives stable,
+# collision-free widget keys without per-rerun hash() calls
+EXAMPLE_PROMPTS = tuple(
+    (f"example_{i}", prompt)
+    for i, prompt in enumerate([
+        "How does the shopping cart work?",
+        "What features does the product catalog have?",
+        "How do users manage their accounts?",
+        "What is the order placement process?",
+        "How secure is the platform?",
+        "What makes the design user-friendly?",
+        "How do customers browse products?",
+        "What are the key platform benefits?"
+    ])
+)
+
+@st.cache_resource
+def get_http_session():
+    """Shared requests session so the API connection survives reruns"""
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+    return session
+
+@st.cache_data(ttl=10, show_spinner=False)
 def check_api_health():
-    """Check if the FastAPI server is running"""
+    """Check if the FastAPI server is running (cached for 10s per rerun)"""
     try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=5)
+        response = get_http_session().get(f"{API_BASE_URL}/health", timeout=5)
         return response.status_code == 200
     except requests.exceptions.RequestException:
         return False
 
-def send_message(message, conversation_history=None):
-    """Send message to the chatbot API with conversation history"""
+def build_payload(message, conversation_history=None):
+    """Build the request payload; history lives server-side per session.
+
+    Only the session id and the new message travel each turn, so turn N no
+    longer serializes and re-sends the previous N-1 messages.
+    """
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return {"message": message, "session_id": st.session_state.session_id}
+
+def stream_message(message, conversation_history=None, sources_out=None):
+    """Yield reply tokens from the streaming chatbot endpoint.
+
+    Sources arrive as an SSE preamble event and are appended to sources_out;
+    tokens are yielded as they are generated so st.write_stream renders them
+    incrementally instead of blocking on the full reply.
+    """
     try:
-        # Prepare the request payload
-        payload = {"message": message}
-        
-        # Add conversation history if available (exclude the current message)
-        if conversation_history:
-            # Filter out the current message and convert to API format
-            history = []
-            for msg in conversation_history[:-1]:  # Exclude the last message (current one)
-                if msg["role"] in ["user", "assistant"]:
-                    history.append({
-                        "role": msg["role"],
-                        "content": msg["content"]
-                    })
-            payload["history"] = history
-        
-        with st.spinner("🤖 Thinking..."):
-            response = requests.post(
-                CHATBOT_ENDPOINT,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=30
-            )
-        
-        if response.status_code == 200:
-            response_data = response.json()
-            return {
-                "reply": response_data["reply"],
-                "sources": response_data.get("sources", [])
-            }
-        else:
-            return {
-                "reply": f"❌ Error: {response.status_code} - {response.text}",
-                "sources": []
-            }
-    
+        with get_http_session().post(
+            CHATBOT_STREAM_ENDPOINT,
+            json=build_payload(message, conversation_history),
+            headers={"Content-Type": "application/json"},
+            stream=True,
+            timeout=(5, 300)
+        ) as response:
+            response.raise_for_status()
+            event = None
+            for line in response.iter_lines(decode_unicode=True):
+                if not line:
+                    event = None
+                    continue
+                if line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    data = line[len("data:"):].strip()
+                    if event == "sources":
+                        if sources_out is not None:
+                            try:
+                                sources_out.extend(json.loads(data))
+                            except ValueError:
+                                pass
+                    elif event == "done":
+                        break
+                    else:
+                        try:
+                            yield json.loads(data).get("token", "")
+                        except ValueError:
+                            pass
     except requests.exceptions.Timeout:
-        return {
-            "reply": "⏱️ Request timed out. The chatbot might be processing a complex request.",
-            "sources": []
-        }
+        yield "⏱️ Request timed out. The chatbot might be processing a complex request."
     except requests.exceptions.ConnectionError:
-        return {
-            "reply": "🔌 Connection error. Make sure the FastAPI server is running on http://127.0.0.1:8000",
-            "sources": []
-        }
+        yield "🔌 Connection error. Make sure the FastAPI server is running on http://127.0.0.1:8000"
     except Exception as e:
-        return {
-            "reply": f"💥 Unexpected error: {str(e)}",
-            "sources": []
-        }
+        yield f"💥 Unexpected error: {str(e)}"
+
+@st.cache_data(
+    show_spinner=False,
+    hash_funcs={list: lambda sources: tuple(
+        (s["chunk_id"], s["source"], s["content_preview"]) for s in sources
+    )},
+)
+def render_sources_html(sources):
+    """One HTML block per sources list; cached since sources are immutable.
+
+    Titles and previews carry external text (GitHub/Jira content via the
+    orchestrator), so they are escaped before being joined into raw HTML.
+    """
+    return "<hr>".join(
+        f"<b>Source {html.escape(str(s['chunk_id']))}:</b> {html.escape(str(s['source']))}<br>"
+        f"<i>Preview:</i> {html.escape(str(s['content_preview']))}"
+        for s in sources
+    )
 
 def display_sources(sources):
     """Display source information in an expandable section"""
     if sources and len(sources) > 0:
         with st.expander(f"📚 Sources ({len(sources)} documents)", expanded=False):
-            for i, source in enumerate(sources):
-                st.markdown(f"**Source {source['chunk_id']}:** {source['source']}")
-                st.markdown(f"*Preview:* {source['content_preview']}")
-                if i < len(sources) - 1:
-                    st.divider()
+            # Single element instead of two markdowns plus a divider per
+            # source, so each message ships one payload to the frontend
+            st.markdown(render_sources_html(sources), unsafe_allow_html=True)
+
+@st.fragment
+def render_chat():
+    """Chat transcript, isolated so widget interactions elsewhere do not
+    re-render every historical message and sources expander"""
+    for message in st.session_state.messages:
+        if message["role"] == "user":
+            with st.chat_message("user", avatar="👤"):
+                st.write(message["content"])
+        else:
+            with st.chat_message("assistant", avatar="🤖"):
+                st.write(message["content"])
+                # Display sources if available
+                if "sources" in message:
+                    display_sources(message["sources"])
+                if "timestamp_str" in message:
+                    st.caption(f"⏰ {message['timestamp_str']}")
+
+def handle_prompt(prompt):
+    """Run one exchange: render it inline as it streams, then record it.
+
+    Both the chat input and the example buttons funnel through here, so
+    there is a single LLM call per turn and no explicit st.rerun() — the
+    inline preview already shows the exchange and render_chat picks it up
+    from session state on subsequent runs.
+    """
+    with st.chat_message("user", avatar="👤"):
+        st.write(prompt)
+
+    with st.chat_message("assistant", avatar="🤖"):
+        sources = []
+        reply = st.write_stream(stream_message(prompt, st.session_state.messages, sources))
+        display_sources(sources)
+        timestamp_str = time.strftime("%H:%M:%S", time.localtime())
+        st.caption(f"⏰ {timestamp_str}")
+
+    # Record both turn entries in one mutation
+    st.session_state.messages.extend([
+        {
+            "role": "user",
+            "content": prompt
+        },
+        {
+            "role": "assistant",
+            "content": reply,
+            "sources": sources,
+            "timestamp_str": timestamp_str
+        },
+    ])
 
 def main():
     # Header
@@ -98,30 +217,7 @@ def main():
     with st.sidebar:
         st.header("🛒 Platform Assistant")
         
-        st.markdown("""
-        **🛍️ What I Can Help With**
-        - Product catalog features
-        - Shopping cart functionality
-        - User account management
-        - Order placement process
-        - Platform capabilities
-        
-        **💡 How It Works**
-        - Your question → Search knowledge base
-        - Retrieve relevant information
-        - Provide clear, user-friendly answers
-        
-        **🎯 Best Questions**
-        - "How does the shopping cart work?"
-        - "What user account features are available?"
-        - "How do customers place orders?"
-        - "What makes the platform secure?"
-        
-        **⚡ Features**
-        - E-commerce focused responses
-        - User experience explanations
-        - Business value insights
-        """)
+        st.markdown(SIDEBAR_HELP_MD)
         
         st.divider()
         
@@ -137,19 +233,8 @@ def main():
         
         # Example prompts
         st.header("💡 Try These Examples")
-        example_prompts = [
-            "How does the shopping cart work?",
-            "What features does the product catalog have?",
-            "How do users manage their accounts?",
-            "What is the order placement process?",
-            "How secure is the platform?",
-            "What makes the design user-friendly?",
-            "How do customers browse products?",
-            "What are the key platform benefits?"
-        ]
-        
-        for prompt in example_prompts:
-            if st.button(prompt, key=f"example_{hash(prompt)}", use_container_width=True):
+        for key, prompt in EXAMPLE_PROMPTS:
+            if st.button(prompt, key=key, use_container_width=True):
                 st.session_state.example_prompt = prompt
 
     # Initialize chat history
@@ -161,74 +246,23 @@ def main():
             }
         ]
 
-    # Handle example prompts
-    if "example_prompt" in st.session_state:
-        st.session_state.messages.append({
-            "role": "user",
-            "content": st.session_state.example_prompt
-        })
-        
-        # Get response with conversation history
-        response_data = send_message(st.session_state.example_prompt, st.session_state.messages)
-        st.session_state.messages.append({
-            "role": "assistant",
-            "content": response_data["reply"],
-            "sources": response_data.get("sources", []),
-            "timestamp": datetime.now()
-        })
-        
-        # Clear the example prompt
-        del st.session_state.example_prompt
-        st.rerun()
-
     # Display chat history
-    chat_container = st.container()
-    with chat_container:
-        for message in st.session_state.messages:
-            if message["role"] == "user":
-                with st.chat_message("user", avatar="👤"):
-                    st.write(message["content"])
-            else:
-                with st.chat_message("assistant", avatar="🤖"):
-                    st.write(message["content"])
-                    # Display sources if available
-                    if "sources" in message:
-                        display_sources(message["sources"])
-                    if "timestamp" in message:
-                        st.caption(f"⏰ {message['timestamp'].strftime('%H:%M:%S')}")
-
-    # Chat input
-    if prompt := st.chat_input("Ask me about the e-commerce platform features, shopping experience, or functionality..."):
-        # Add user message to chat history
-        st.session_state.messages.append({
-            "role": "user",
-            "content": prompt
-        })
-        
-        # Display user message immediately
-        with st.chat_message("user", avatar="👤"):
-            st.write(prompt)
-        
-        # Get and display assistant response
-        with st.chat_message("assistant", avatar="🤖"):
-            response_data = send_message(prompt, st.session_state.messages)
-            st.write(response_data["reply"])
-            # Display sources
-            display_sources(response_data.get("sources", []))
-            st.caption(f"⏰ {datetime.now().strftime('%H:%M:%S')}")
-        
-        # Add assistant response to chat history
-        st.session_state.messages.append({
-            "role": "assistant",
-            "content": response_data["reply"],
-            "sources": response_data.get("sources", []),
-            "timestamp": datetime.now()
-        })
+    render_chat()
+
+    # Chat input. An example-button click queues its prompt through the same
+    # handler, so both paths share one streamed call and neither needs an
+    # explicit st.rerun().
+    prompt = st.chat_input("Ask me about the e-commerce platform features, shopping experience, or functionality...")
+    if prompt is None:
+        prompt = st.session_state.pop("example_prompt", None)
+    if prompt:
+        handle_prompt(prompt)
 
     # Clear chat button
     col1, col2, col3 = st.columns([1, 1, 1])
     with col2:
         if st.button("🗑️ Clear Chat", use_container_width=True):
+            st.session_state.session_id = uuid.uuid4().hex
             st.session_state.messages = [
                 {
                     "role": "assistant", 